@@ -12,28 +12,68 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from homeassistant.loader import async_get_integration
+from homeassistant.util import slugify
 
 from .const import (
     CONF_HOSTNAME,
+    DEFAULT_FEED_IN_BATTERY_DEADBAND,
+    DEFAULT_FEED_IN_HEARTBEAT,
+    DEFAULT_FEED_IN_MIN_INTERVAL,
+    DEFAULT_FEED_IN_POWER_DEADBAND,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_REFRESH_INTERVAL,
+    DEFAULT_REGISTER_COST,
+    DEFAULT_REQUEST_COST,
+    DEFAULT_REQUEST_DEADLINE,
     DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SLOW_REFRESH_INTERVAL,
+    DEFAULT_WRITE_DEADBAND,
+    DEFAULT_WRITE_MIN_INTERVAL,
+    DEFAULT_WRITE_WINDOW,
     DOMAIN,
+    FEED_IN_TARGETS,
+    FRAME_RECORDER_BACKUP_COUNT,
+    FRAME_RECORDER_MAX_BYTES,
     ISSUE_URL,
     NAME,
+    OPT_FAST_REFRESH_INTERVAL,
+    OPT_FEED_IN_BATTERY_DEADBAND,
+    OPT_FEED_IN_HEARTBEAT,
+    OPT_FEED_IN_MIN_INTERVAL,
+    OPT_FEED_IN_POWER_DEADBAND,
+    OPT_FEED_IN_SOURCE,
     OPT_HEATING_CIRCUITS,
+    OPT_MAX_CONCURRENT_REQUESTS,
     OPT_MAX_POWER_USAGE,
     OPT_READ_WITHOUT_GROUPS,
+    OPT_RECORD_FRAMES,
     OPT_REFRESH_INTERVAL,
+    OPT_REGISTER_COST,
+    OPT_REQUEST_COST,
+    OPT_REQUEST_DEADLINE,
     OPT_REQUEST_TIMEOUT,
+    OPT_SLOW_REFRESH_INTERVAL,
+    OPT_TIER_SENSORS,
+    OPT_VERIFY_WRITES,
+    OPT_WRITE_DEADBAND,
+    OPT_WRITE_MIN_INTERVAL,
+    OPT_WRITE_WINDOW,
     OPT_ZONE_COUNT,
     OPT_ZONE_ROOM_9_RELAY,
     OPT_ZONE_ROOM_COUNT,
+    SERVICE_WRITE_VALUES,
     STARTUP_MESSAGE_TEMPLATE,
+    PollTier,
 )
 from .coordinator import IdmHeatpumpDataUpdateCoordinator
+from .entity_tables import EntityTables
+from .feed_in import FeedInPipeline
+from .frame_recorder import FrameRecorder
+from .group_planner import RequestCostModel
 from .idm_heatpump import IdmHeatpump
 from .logger import LOGGER
 from .sensor_addresses import HeatingCircuit, ZoneModule
+from .services import register_write_values_service
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
@@ -76,30 +116,117 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         ],
         no_groups=entry.options.get(OPT_READ_WITHOUT_GROUPS, False),
         max_power_usage=max_power_usage if max_power_usage != 0.0 else None,
+        cost_model=RequestCostModel(
+            request_cost=entry.options.get(OPT_REQUEST_COST, DEFAULT_REQUEST_COST),
+            register_cost=entry.options.get(OPT_REGISTER_COST, DEFAULT_REGISTER_COST),
+        ),
+        max_concurrent_requests=entry.options.get(
+            OPT_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        request_deadline=timedelta(
+            **entry.options.get(OPT_REQUEST_DEADLINE, DEFAULT_REQUEST_DEADLINE)
+        ),
+        tier_sensors={
+            tier: entry.options.get(OPT_TIER_SENSORS[tier], []) for tier in PollTier
+        },
     )
 
+    if entry.options.get(OPT_RECORD_FRAMES, False):
+        heatpump.frame_recorder = FrameRecorder(
+            hass.config.path(DOMAIN, f"{slugify(hostname)}.frames"),
+            max_bytes=FRAME_RECORDER_MAX_BYTES,
+            backup_count=FRAME_RECORDER_BACKUP_COUNT,
+        )
+
     update_interval = timedelta(
         **entry.options.get(OPT_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL)
     )
+    # entries without a fast interval keep polling everything at the same rate
+    fast_interval = entry.options.get(OPT_FAST_REFRESH_INTERVAL)
+    tier_intervals = {
+        PollTier.FAST: update_interval
+        if fast_interval is None
+        else min(update_interval, timedelta(**fast_interval)),
+        PollTier.NORMAL: update_interval,
+        PollTier.SLOW: max(
+            update_interval,
+            timedelta(
+                **entry.options.get(
+                    OPT_SLOW_REFRESH_INTERVAL, DEFAULT_SLOW_REFRESH_INTERVAL
+                )
+            ),
+        ),
+    }
     timeout_delta = timedelta(
         **entry.options.get(OPT_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT)
     )
     LOGGER.debug(
-        "Setting up IDM heat pump at %s with update_interval=%s",
+        "Setting up IDM heat pump at %s with tier_intervals=%s",
         hostname,
-        update_interval,
+        tier_intervals,
     )
     coordinator = IdmHeatpumpDataUpdateCoordinator(
         hass,
         heatpump=heatpump,
-        update_interval=update_interval,
+        hostname=hostname,
+        entity_tables=EntityTables(entry, heatpump.sensors),
+        tier_intervals=tier_intervals,
         timeout_delta=timeout_delta,
+        write_window=entry.options.get(OPT_WRITE_WINDOW, DEFAULT_WRITE_WINDOW),
+        write_deadband=entry.options.get(OPT_WRITE_DEADBAND, DEFAULT_WRITE_DEADBAND),
+        write_min_interval=entry.options.get(
+            OPT_WRITE_MIN_INTERVAL, DEFAULT_WRITE_MIN_INTERVAL
+        ),
+        verify_writes=entry.options.get(OPT_VERIFY_WRITES, False),
     )
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.async_track_disabled_sensors(entry.entry_id))
+
+    try:
+        await coordinator.async_load_learned_state()
+        # with values of the last run the first refresh is done in the background
+        restored = await coordinator.async_load_snapshot()
+        if not restored:
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        heatpump.close()
+        del hass.data[DOMAIN][entry.entry_id]
+        raise
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+
+    feed_in_sources = {
+        target: entry.options[OPT_FEED_IN_SOURCE[target]]
+        for target in FEED_IN_TARGETS
+        if entry.options.get(OPT_FEED_IN_SOURCE[target])
+    }
+    if feed_in_sources:
+        coordinator.feed_in = FeedInPipeline(
+            hass,
+            coordinator.async_send_values,
+            feed_in_sources,
+            min_interval=entry.options.get(
+                OPT_FEED_IN_MIN_INTERVAL, DEFAULT_FEED_IN_MIN_INTERVAL
+            ),
+            power_deadband=entry.options.get(
+                OPT_FEED_IN_POWER_DEADBAND, DEFAULT_FEED_IN_POWER_DEADBAND
+            ),
+            battery_deadband=entry.options.get(
+                OPT_FEED_IN_BATTERY_DEADBAND, DEFAULT_FEED_IN_BATTERY_DEADBAND
+            ),
+            heartbeat=timedelta(
+                **entry.options.get(OPT_FEED_IN_HEARTBEAT, DEFAULT_FEED_IN_HEARTBEAT)
+            ),
+        )
+        coordinator.feed_in.async_start()
+
+    register_write_values_service(hass)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -113,14 +240,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             entry.entry_id
         ]
 
-        # Ensure disconnected and cleanup stop sub
-        coordinator.heatpump.client.close()
+        # Ensure pending writes are sent, disconnected and cleanup stop sub
+        if coordinator.feed_in is not None:
+            await coordinator.feed_in.async_stop()
+        await coordinator.write_scheduler.async_shutdown()
+        coordinator.heatpump.close()
+        await coordinator.async_write_frames()
+        await coordinator.async_save_snapshot()
 
         del hass.data[DOMAIN][entry.entry_id]
 
     if not hass.data[DOMAIN]:
         # remove services
-        pass
+        hass.services.async_remove(DOMAIN, SERVICE_WRITE_VALUES)
 
     return unload_ok
 
@@ -37,7 +37,6 @@ async def async_setup_entry(
         hass,
         SERVICE_SET_BINARY,
         SensorFeatures.SET_BINARY,
-        lambda v, _: bool(v),
     )
 
 
@@ -51,9 +50,8 @@ class IdmHeatpumpBinarySensor(IdmHeatpumpEntity, BinarySensorEntity):
         sensor_address: IdmBinarySensorAddress,
     ):
         """Create binary sensor."""
-        super().__init__(coordinator, config_entry)
+        super().__init__(coordinator, config_entry, sensor_address)
 
-        self.sensor_address = sensor_address
         self.entity_description = self.sensor_address.entity_description(config_entry)
 
     @property
@@ -7,31 +7,68 @@ from typing import Any, Self
 import voluptuous as vol
 from homeassistant.config import cv
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
-from homeassistant.const import UnitOfPower
+from homeassistant.const import PERCENTAGE, UnitOfPower, UnitOfTime
 from homeassistant.core import callback
 from homeassistant.helpers.selector import selector
 
 from .const import (
     CONF_DISPLAY_NAME,
     CONF_HOSTNAME,
+    DEFAULT_FEED_IN_BATTERY_DEADBAND,
+    DEFAULT_FEED_IN_HEARTBEAT,
+    DEFAULT_FEED_IN_MIN_INTERVAL,
+    DEFAULT_FEED_IN_POWER_DEADBAND,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_REFRESH_INTERVAL,
+    DEFAULT_REGISTER_COST,
+    DEFAULT_REQUEST_COST,
+    DEFAULT_REQUEST_DEADLINE,
     DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SLOW_REFRESH_INTERVAL,
+    DEFAULT_WRITE_DEADBAND,
+    DEFAULT_WRITE_MIN_INTERVAL,
+    DEFAULT_WRITE_WINDOW,
     DOMAIN,
+    FEED_IN_TARGETS,
     MAX_ROOM_COUNT,
     MAX_ZONE_COUNT,
     MIN_REFRESH_INTERVAL,
     OPT_ALLOW_FAST_REFRESH,
+    OPT_FAST_REFRESH_INTERVAL,
+    OPT_FEED_IN_BATTERY_DEADBAND,
+    OPT_FEED_IN_HEARTBEAT,
+    OPT_FEED_IN_MIN_INTERVAL,
+    OPT_FEED_IN_POWER_DEADBAND,
+    OPT_FEED_IN_SOURCE,
     OPT_HEATING_CIRCUITS,
+    OPT_MAX_CONCURRENT_REQUESTS,
     OPT_MAX_POWER_USAGE,
     OPT_READ_WITHOUT_GROUPS,
+    OPT_RECORD_FRAMES,
     OPT_REFRESH_INTERVAL,
+    OPT_REGISTER_COST,
+    OPT_REQUEST_COST,
+    OPT_REQUEST_DEADLINE,
     OPT_REQUEST_TIMEOUT,
+    OPT_SLOW_REFRESH_INTERVAL,
+    OPT_TIER_SENSORS,
+    OPT_VERIFY_WRITES,
+    OPT_WRITE_DEADBAND,
+    OPT_WRITE_MIN_INTERVAL,
+    OPT_WRITE_WINDOW,
     OPT_ZONE_COUNT,
     OPT_ZONE_ROOM_9_RELAY,
     OPT_ZONE_ROOM_COUNT,
+    PollTier,
+)
+from .discovery import async_discover, async_probe
+from .logger import LOGGER
+from .sensor_addresses import (
+    BINARY_SENSOR_ADDRESSES,
+    SENSOR_ADDRESSES,
+    HeatingCircuit,
+    heating_circuit_sensors,
 )
-from .idm_heatpump import IdmHeatpump
-from .sensor_addresses import HeatingCircuit
 
 
 class IdmHeatpumpFlowHandler(ConfigFlow, domain=DOMAIN):
@@ -73,6 +110,7 @@ class IdmHeatpumpFlowHandler(ConfigFlow, domain=DOMAIN):
                 errors[CONF_HOSTNAME] = "hostname"
 
             if len(errors) == 0:
+                await self._discover(user_input[CONF_HOSTNAME])
                 return await self.async_step_options()
 
         return self.async_show_form(
@@ -86,7 +124,7 @@ class IdmHeatpumpFlowHandler(ConfigFlow, domain=DOMAIN):
 
         result = _async_step_base_options(self._options, user_input)
         if result is None:
-            return await self.async_step_zones(user_input)
+            return await self.async_step_advanced(user_input)
 
         [schema, errors] = result
 
@@ -96,6 +134,34 @@ class IdmHeatpumpFlowHandler(ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_advanced(self, user_input=None):
+        """Step to configure advanced options."""
+        result = _async_step_advanced_options(self._options, user_input)
+        if result is None:
+            return await self.async_step_feed_in(user_input)
+
+        [schema, errors] = result
+
+        return self.async_show_form(
+            step_id="advanced",
+            data_schema=schema,
+            errors=errors,
+        )
+
+    async def async_step_feed_in(self, user_input=None):
+        """Step to configure the feed-in of PV and battery values."""
+        result = _async_step_feed_in_options(self._options, user_input)
+        if result is None:
+            return await self.async_step_zones(user_input)
+
+        [schema, errors] = result
+
+        return self.async_show_form(
+            step_id="feed_in",
+            data_schema=schema,
+            errors=errors,
+        )
+
     async def async_step_zones(self, user_input=None):
         """Handle a flow for zones."""
         result = _async_step_zone_options(self._options, user_input)
@@ -123,10 +189,35 @@ class IdmHeatpumpFlowHandler(ConfigFlow, domain=DOMAIN):
     async def _test_hostname(self, hostname):
         """Return true if hostname is valid."""
         try:
-            return await IdmHeatpump.test_hostname(hostname)
+            result = await async_probe(hostname)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.debug("probing %s failed", hostname, exc_info=True)
+            return False
+
+        if result.reachable:
+            LOGGER.info(
+                "found heat pump at %s, latency %.0f ms, firmware %s, status %s",
+                hostname,
+                result.latency * 1000,
+                result.firmware,
+                result.system_status,
+            )
+        return result.reachable
+
+    async def _discover(self, hostname):
+        """Preset options for the installed heating circuits and zones."""
+        try:
+            result = await async_discover(hostname)
         except Exception:  # pylint: disable=broad-except
-            pass
-        return False
+            LOGGER.warning("discovery of circuits and zones failed", exc_info=True)
+            return
+
+        if len(result.circuits) > 0:
+            self._options[OPT_HEATING_CIRCUITS] = [c.name for c in result.circuits]
+        self._options[OPT_ZONE_COUNT] = len(result.zones)
+        for zone in result.zones:
+            self._options[OPT_ZONE_ROOM_COUNT[zone.index]] = zone.room_count
+            self._options[OPT_ZONE_ROOM_9_RELAY[zone.index]] = zone.room_9_relay
 
     def is_matching(self, other_flow: Self) -> bool:
         """Return True if other_flow is matching this flow."""
@@ -147,7 +238,7 @@ class IdmHeatpumpOptionsFlowHandler(OptionsFlow):
         """Step to configure options."""
         result = _async_step_base_options(self.options, user_input)
         if result is None:
-            return await self.async_step_zones(user_input)
+            return await self.async_step_advanced(user_input)
 
         [schema, errors] = result
 
@@ -157,6 +248,34 @@ class IdmHeatpumpOptionsFlowHandler(OptionsFlow):
             errors=errors,
         )
 
+    async def async_step_advanced(self, user_input=None):
+        """Step to configure advanced options."""
+        result = _async_step_advanced_options(self.options, user_input)
+        if result is None:
+            return await self.async_step_feed_in(user_input)
+
+        [schema, errors] = result
+
+        return self.async_show_form(
+            step_id="advanced",
+            data_schema=schema,
+            errors=errors,
+        )
+
+    async def async_step_feed_in(self, user_input=None):
+        """Step to configure the feed-in of PV and battery values."""
+        result = _async_step_feed_in_options(self.options, user_input)
+        if result is None:
+            return await self.async_step_zones(user_input)
+
+        [schema, errors] = result
+
+        return self.async_show_form(
+            step_id="feed_in",
+            data_schema=schema,
+            errors=errors,
+        )
+
     async def async_step_zones(self, user_input=None):
         """Handle a flow for zones."""
         result = _async_step_zone_options(self.options, user_input)
@@ -185,6 +304,19 @@ def _async_step_base_options(
                 OPT_REFRESH_INTERVAL,
                 default=options.get(OPT_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL),
             ): vol.All(selector({"duration": {}})),
+            vol.Required(
+                OPT_FAST_REFRESH_INTERVAL,
+                default=options.get(
+                    OPT_FAST_REFRESH_INTERVAL,
+                    options.get(OPT_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL),
+                ),
+            ): vol.All(selector({"duration": {}})),
+            vol.Required(
+                OPT_SLOW_REFRESH_INTERVAL,
+                default=options.get(
+                    OPT_SLOW_REFRESH_INTERVAL, DEFAULT_SLOW_REFRESH_INTERVAL
+                ),
+            ): vol.All(selector({"duration": {}})),
             vol.Optional(
                 OPT_ALLOW_FAST_REFRESH,
                 default=options.get(OPT_ALLOW_FAST_REFRESH, False),
@@ -246,14 +378,27 @@ def _async_step_base_options(
     if user_input is not None:
         options.update(user_input)
 
-        if not options[OPT_ALLOW_FAST_REFRESH] and timedelta(
-            **options[OPT_REFRESH_INTERVAL]
-        ) < timedelta(**MIN_REFRESH_INTERVAL):
+        refresh_interval = timedelta(**options[OPT_REFRESH_INTERVAL])
+        fast_refresh_interval = timedelta(**options[OPT_FAST_REFRESH_INTERVAL])
+        slow_refresh_interval = timedelta(**options[OPT_SLOW_REFRESH_INTERVAL])
+
+        if not options[OPT_ALLOW_FAST_REFRESH] and refresh_interval < timedelta(
+            **MIN_REFRESH_INTERVAL
+        ):
             errors[OPT_REFRESH_INTERVAL] = "min_refresh_interval"
 
-        if timedelta(**options[OPT_REFRESH_INTERVAL]) < timedelta(
-            **options[OPT_REQUEST_TIMEOUT]
+        if not options[OPT_ALLOW_FAST_REFRESH] and fast_refresh_interval < timedelta(
+            **MIN_REFRESH_INTERVAL
         ):
+            errors[OPT_FAST_REFRESH_INTERVAL] = "min_refresh_interval"
+
+        if fast_refresh_interval > refresh_interval:
+            errors[OPT_FAST_REFRESH_INTERVAL] = "fast_refresh_interval"
+
+        if slow_refresh_interval < refresh_interval:
+            errors[OPT_SLOW_REFRESH_INTERVAL] = "slow_refresh_interval"
+
+        if fast_refresh_interval < timedelta(**options[OPT_REQUEST_TIMEOUT]):
             errors[OPT_REQUEST_TIMEOUT] = "request_refresh_interval"
 
         if len(errors) == 0:
@@ -262,6 +407,243 @@ def _async_step_base_options(
     return [schema, errors]
 
 
+def _async_step_advanced_options(
+    options: dict[str, Any],
+    user_input=None,
+) -> tuple[vol.Schema, dict[str, str]] | None:
+    sensor_names = [
+        *SENSOR_ADDRESSES,
+        *BINARY_SENSOR_ADDRESSES,
+        *[
+            s.name
+            for c in options.get(OPT_HEATING_CIRCUITS, [])
+            for s in heating_circuit_sensors(HeatingCircuit[c])
+        ],
+    ]
+
+    schema = vol.Schema(
+        {
+            vol.Required(
+                OPT_REQUEST_COST,
+                default=options.get(OPT_REQUEST_COST, DEFAULT_REQUEST_COST),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "step": "any",
+                        "mode": "box",
+                        "unit_of_measurement": UnitOfTime.MILLISECONDS,
+                    }
+                }
+            ),
+            vol.Required(
+                OPT_REGISTER_COST,
+                default=options.get(OPT_REGISTER_COST, DEFAULT_REGISTER_COST),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "step": "any",
+                        "mode": "box",
+                        "unit_of_measurement": UnitOfTime.MILLISECONDS,
+                    }
+                }
+            ),
+            vol.Required(
+                OPT_MAX_CONCURRENT_REQUESTS,
+                default=options.get(
+                    OPT_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                ),
+            ): vol.All(
+                selector(
+                    {
+                        "number": {
+                            "min": 1,
+                            "max": 16,
+                        }
+                    }
+                ),
+                cv.positive_int,
+            ),
+            vol.Required(
+                OPT_REQUEST_DEADLINE,
+                default=options.get(OPT_REQUEST_DEADLINE, DEFAULT_REQUEST_DEADLINE),
+            ): vol.All(selector({"duration": {}})),
+            vol.Required(
+                OPT_RECORD_FRAMES,
+                default=options.get(OPT_RECORD_FRAMES, False),
+            ): bool,
+            vol.Required(
+                OPT_WRITE_WINDOW,
+                default=options.get(OPT_WRITE_WINDOW, DEFAULT_WRITE_WINDOW),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "step": "any",
+                        "mode": "box",
+                        "unit_of_measurement": UnitOfTime.SECONDS,
+                    }
+                }
+            ),
+            vol.Required(
+                OPT_WRITE_DEADBAND,
+                default=options.get(OPT_WRITE_DEADBAND, DEFAULT_WRITE_DEADBAND),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "step": "any",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Required(
+                OPT_WRITE_MIN_INTERVAL,
+                default=options.get(OPT_WRITE_MIN_INTERVAL, DEFAULT_WRITE_MIN_INTERVAL),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "step": "any",
+                        "mode": "box",
+                        "unit_of_measurement": UnitOfTime.SECONDS,
+                    }
+                }
+            ),
+            vol.Required(
+                OPT_VERIFY_WRITES,
+                default=options.get(OPT_VERIFY_WRITES, False),
+            ): bool,
+            **{
+                vol.Optional(
+                    OPT_TIER_SENSORS[tier],
+                    default=options.get(OPT_TIER_SENSORS[tier], []),
+                ): selector(
+                    {
+                        "select": {
+                            # zone sensors and patterns are entered as custom values
+                            "options": sensor_names,
+                            "multiple": True,
+                            "custom_value": True,
+                        }
+                    }
+                )
+                for tier in PollTier
+            },
+        }
+    )
+
+    errors = {}
+
+    if user_input is not None and OPT_REQUEST_COST in user_input:
+        options.update(user_input)
+
+        seen: set[str] = set()
+        for tier in PollTier:
+            names = set(options.get(OPT_TIER_SENSORS[tier], []))
+            if names & seen:
+                errors[OPT_TIER_SENSORS[tier]] = "tier_sensors"
+            seen |= names
+
+        if len(errors) == 0:
+            return None
+
+    return [schema, errors]
+
+
+def _async_step_feed_in_options(
+    options: dict[str, Any],
+    user_input=None,
+) -> tuple[vol.Schema, dict[str, str]] | None:
+    schema = vol.Schema(
+        {
+            **{
+                vol.Optional(
+                    OPT_FEED_IN_SOURCE[target],
+                    description={
+                        "suggested_value": options.get(OPT_FEED_IN_SOURCE[target])
+                    },
+                ): selector(
+                    {
+                        "entity": {
+                            "domain": "sensor",
+                            "device_class": SENSOR_ADDRESSES[target].device_class,
+                        }
+                    }
+                )
+                for target in FEED_IN_TARGETS
+            },
+            vol.Required(
+                OPT_FEED_IN_MIN_INTERVAL,
+                default=options.get(
+                    OPT_FEED_IN_MIN_INTERVAL, DEFAULT_FEED_IN_MIN_INTERVAL
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "step": "any",
+                        "mode": "box",
+                        "unit_of_measurement": UnitOfTime.SECONDS,
+                    }
+                }
+            ),
+            vol.Required(
+                OPT_FEED_IN_POWER_DEADBAND,
+                default=options.get(
+                    OPT_FEED_IN_POWER_DEADBAND, DEFAULT_FEED_IN_POWER_DEADBAND
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "step": "any",
+                        "mode": "box",
+                        "unit_of_measurement": UnitOfPower.KILO_WATT,
+                    }
+                }
+            ),
+            vol.Required(
+                OPT_FEED_IN_BATTERY_DEADBAND,
+                default=options.get(
+                    OPT_FEED_IN_BATTERY_DEADBAND, DEFAULT_FEED_IN_BATTERY_DEADBAND
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 100,
+                        "step": "any",
+                        "mode": "box",
+                        "unit_of_measurement": PERCENTAGE,
+                    }
+                }
+            ),
+            vol.Required(
+                OPT_FEED_IN_HEARTBEAT,
+                default=options.get(OPT_FEED_IN_HEARTBEAT, DEFAULT_FEED_IN_HEARTBEAT),
+            ): vol.All(selector({"duration": {}})),
+        }
+    )
+
+    errors = {}
+
+    if user_input is not None and OPT_FEED_IN_HEARTBEAT in user_input:
+        # cleared sources are missing in the input
+        for target in FEED_IN_TARGETS:
+            options.pop(OPT_FEED_IN_SOURCE[target], None)
+        options.update(user_input)
+
+        if timedelta(**options[OPT_FEED_IN_HEARTBEAT]) <= timedelta():
+            errors[OPT_FEED_IN_HEARTBEAT] = "feed_in_heartbeat"
+
+        if len(errors) == 0:
+            return None
+
+    return [schema, errors]
+
+
 def _async_step_zone_options(
     options: dict[str, Any],
     user_input=None,
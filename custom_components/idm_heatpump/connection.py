@@ -0,0 +1,77 @@
+"""Modbus connections shared by everything talking to the same controller.
+
+IDM controllers accept very few TCP connections and a new connection often
+drops an existing one. Config entries, the config flow and services therefore
+use one connection per controller, which is closed once nobody uses it.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from .logger import LOGGER
+
+
+@dataclass(eq=False)
+class SharedConnection:
+    """Modbus TCP client and request window of one controller."""
+
+    host: str
+    port: int
+    client: AsyncModbusTcpClient
+    # limits the number of outstanding transactions of all users
+    window: asyncio.Semaphore
+    connect_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    references: int = 0
+    # connects by all users, including the config flow and discovery
+    connects: int = 0
+
+    async def async_connect(self) -> bool:
+        """Connect the client, the caller must hold `connect_lock`."""
+        connected = await self.client.connect()
+        self.connects += 1
+        return connected
+
+    @property
+    def reconnects(self) -> int:
+        """Get the number of connects after the first one."""
+        return max(self.connects - 1, 0)
+
+
+_CONNECTIONS: dict[tuple[str, int], SharedConnection] = {}
+
+
+def acquire_connection(
+    host: str, port: int, max_concurrent_requests: int
+) -> SharedConnection:
+    """Get the connection to a controller, creating it if needed.
+
+    The window of a new connection allows `max_concurrent_requests`
+    outstanding requests, existing connections keep their window. Every call
+    must be paired with `release_connection`.
+    """
+    connection = _CONNECTIONS.get((host, port))
+    if connection is None:
+        LOGGER.debug("creating connection to %s:%d", host, port)
+        connection = _CONNECTIONS[(host, port)] = SharedConnection(
+            host=host,
+            port=port,
+            client=AsyncModbusTcpClient(host=host, port=port),
+            window=asyncio.Semaphore(max_concurrent_requests),
+        )
+
+    connection.references += 1
+    return connection
+
+
+def release_connection(connection: SharedConnection):
+    """Release a connection returned by `acquire_connection`."""
+    connection.references -= 1
+    if connection.references > 0:
+        return
+
+    LOGGER.debug("closing connection to %s:%d", connection.host, connection.port)
+    connection.client.close()
+    if _CONNECTIONS.get((connection.host, connection.port)) is connection:
+        del _CONNECTIONS[(connection.host, connection.port)]
@@ -18,6 +18,14 @@ class SensorFeatures(IntFlag):
     SET_CIRCUIT_MODE = 128
 
 
+class PollTier(IntEnum):
+    """How often a sensor is read from the heat pump."""
+
+    FAST = 0
+    NORMAL = 1
+    SLOW = 2
+
+
 class _CaseInsensitiveEnumMeta(EnumMeta):
     def __getitem__(cls, item):
         if isinstance(item, str):
@@ -230,11 +238,24 @@ SERVICE_SET_ROOM_MODE = "set_room_mode"
 SERVICE_SET_CIRCUIT_MODE = "set_circuit_mode"
 SERVICE_SET_BINARY = "set_binary"
 SERVICE_SET_SYSTEM_STATUS = "set_system_status"
+SERVICE_WRITE_VALUES = "write_values"
 
 # Limits
 MIN_REFRESH_INTERVAL = {"hours": 0, "minutes": 1, "seconds": 0}
 MAX_ZONE_COUNT = 10
 MAX_ROOM_COUNT = 8
+MODBUS_MAX_READ_COUNT = 125
+MODBUS_MAX_WRITE_COUNT = 123
+MODBUS_PORT = 502
+
+# Sensors that can be fed from Home Assistant entities
+FEED_IN_TARGETS = [
+    "power_solar_surplus",
+    "power_solar_production",
+    "power_use_house",
+    "power_drain_battery",
+    "charge_state_battery",
+]
 
 # Configuration and options
 CONF_ENABLED = "enabled"
@@ -242,6 +263,9 @@ CONF_HOSTNAME = "hostname"
 CONF_DISPLAY_NAME = "display_name"
 
 OPT_REFRESH_INTERVAL = "refresh_interval"
+OPT_FAST_REFRESH_INTERVAL = "fast_refresh_interval"
+OPT_SLOW_REFRESH_INTERVAL = "slow_refresh_interval"
+OPT_TIER_SENSORS = {tier: f"{tier.name.lower()}_sensors" for tier in PollTier}
 OPT_ALLOW_FAST_REFRESH = "allow_fast_refresh"
 OPT_REQUEST_TIMEOUT = "request_timeout"
 OPT_HEATING_CIRCUITS = "heating_circuits"
@@ -250,13 +274,69 @@ OPT_ZONE_ROOM_COUNT = [f"zone_{i}_room_count" for i in range(MAX_ZONE_COUNT)]
 OPT_ZONE_ROOM_9_RELAY = [f"zone_{i}_room_9_relay" for i in range(MAX_ZONE_COUNT)]
 OPT_READ_WITHOUT_GROUPS = "read_without_groups"
 OPT_MAX_POWER_USAGE = "max_power_usage"
+OPT_REQUEST_COST = "request_cost"
+OPT_REGISTER_COST = "register_cost"
+OPT_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+OPT_REQUEST_DEADLINE = "request_deadline"
+OPT_RECORD_FRAMES = "record_frames"
+OPT_WRITE_WINDOW = "write_window"
+OPT_WRITE_DEADBAND = "write_deadband"
+OPT_WRITE_MIN_INTERVAL = "write_min_interval"
+OPT_VERIFY_WRITES = "verify_writes"
+OPT_FEED_IN_SOURCE = {name: f"feed_in_source_{name}" for name in FEED_IN_TARGETS}
+OPT_FEED_IN_MIN_INTERVAL = "feed_in_min_interval"
+OPT_FEED_IN_POWER_DEADBAND = "feed_in_power_deadband"
+OPT_FEED_IN_BATTERY_DEADBAND = "feed_in_battery_deadband"
+OPT_FEED_IN_HEARTBEAT = "feed_in_heartbeat"
 
 NAME_POWER_USAGE = "power_current_draw"
 
 # Defaults
 DEFAULT_NAME = DOMAIN
 DEFAULT_REFRESH_INTERVAL = {"hours": 0, "minutes": 5, "seconds": 0}
+DEFAULT_SLOW_REFRESH_INTERVAL = {"hours": 0, "minutes": 30, "seconds": 0}
 DEFAULT_REQUEST_TIMEOUT = {"hours": 0, "minutes": 0, "seconds": 30}
+DEFAULT_REQUEST_COST = 100.0
+DEFAULT_REGISTER_COST = 5.0
+DEFAULT_MAX_GROUP_SIZE = 32
+DEFAULT_MAX_CONCURRENT_REQUESTS = 2
+DEFAULT_REQUEST_DEADLINE = {"hours": 0, "minutes": 0, "seconds": 5}
+DEFAULT_WRITE_WINDOW = 0.0
+DEFAULT_WRITE_DEADBAND = 0.0
+DEFAULT_WRITE_MIN_INTERVAL = 0.0
+DEFAULT_FEED_IN_MIN_INTERVAL = 10.0
+DEFAULT_FEED_IN_POWER_DEADBAND = 0.05
+DEFAULT_FEED_IN_BATTERY_DEADBAND = 1.0
+DEFAULT_FEED_IN_HEARTBEAT = {"hours": 0, "minutes": 1, "seconds": 0}
+
+# Values of feed-in sources changing within this many seconds are written together
+FEED_IN_WINDOW = 1.0
+
+# Seconds to wait for each read while discovering circuits and zones
+DISCOVERY_REQUEST_TIMEOUT = 1.0
+
+# Seconds to wait for connecting and each read while probing a hostname
+PROBE_REQUEST_TIMEOUT = 0.5
+
+# Register holding the firmware version of the controller
+FIRMWARE_VERSION_ADDRESS = 4116
+
+# Number of consecutive group reads a sensor must fail before it is read separately
+ISOLATION_THRESHOLD = 3
+
+# Number of consecutive failed reads of a group before its gaps or size are blamed
+SPLIT_THRESHOLD = 3
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Maximum age in seconds of the sensor values restored when starting up
+SNAPSHOT_MAX_AGE = 3600
+
+# Recording of raw register frames
+FRAME_RECORDER_MAX_BYTES = 10 * 1024 * 1024
+FRAME_RECORDER_BACKUP_COUNT = 3
 
 STARTUP_MESSAGE_TEMPLATE = """
 -------------------------------------------------------------------
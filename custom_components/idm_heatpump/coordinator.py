@@ -2,15 +2,29 @@
 
 from asyncio import timeout
 from datetime import timedelta
+from time import monotonic
 from typing import TypeVar
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import TimestampDataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    SNAPSHOT_MAX_AGE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    PollTier,
+)
+from .entity_tables import EntityTables
+from .feed_in import FeedInPipeline
 from .idm_heatpump import IdmHeatpump
 from .logger import LOGGER
 from .sensor_addresses import BaseSensorAddress
+from .write_scheduler import WriteScheduler
 
 _T = TypeVar("_T")
 
@@ -20,44 +34,303 @@ class IdmHeatpumpDataUpdateCoordinator(TimestampDataUpdateCoordinator[dict[str,
 
     heatpump: IdmHeatpump
     timeout_delta: timedelta
+    tier_intervals: dict[PollTier, timedelta]
+    learned_store: Store[dict[str, any]]
+    snapshot_store: Store[dict[str, any]]
+    suppressed_updates: int
+    write_scheduler: WriteScheduler
+    verify_writes: bool
+    hostname: str
+    entity_tables: EntityTables
+    feed_in: FeedInPipeline | None
 
     def __init__(
         self,
         hass: HomeAssistant,
         heatpump: IdmHeatpump,
-        update_interval: timedelta,
+        hostname: str,
+        entity_tables: EntityTables,
+        tier_intervals: dict[PollTier, timedelta],
         timeout_delta: timedelta,
+        write_window: float = 0.0,
+        write_deadband: float = 0.0,
+        write_min_interval: float = 0.0,
+        verify_writes: bool = False,
     ) -> None:
         """Initialize."""
         self.heatpump = heatpump
+        self.hostname = hostname
+        self.entity_tables = entity_tables
         self.timeout_delta = timeout_delta
+        self.tier_intervals = tier_intervals
         self.platforms = []
+        self._sensors = {s.name: s for s in heatpump.sensors}
+        self._sensor_tiers = heatpump.sensor_tiers
+        self._tier_last_polled: dict[PollTier, float] = {}
+        # keys that changed in the last update, None means notify all listeners
+        self._changed_keys: set[str] | None = None
+        self._notified_success: bool | None = None
+        self.suppressed_updates = 0
+        self.verify_writes = verify_writes
+        self.feed_in = None
+        self.write_scheduler = WriteScheduler(
+            self.async_send_values,
+            window=write_window,
+            deadband=write_deadband,
+            min_interval=write_min_interval,
+        )
+        # learned limits belong to the controller, not to the config entry
+        self.learned_store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{slugify(hostname)}.learned"
+        )
+        self.snapshot_store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{slugify(hostname)}.snapshot"
+        )
 
-        super().__init__(hass, LOGGER, name=DOMAIN, update_interval=update_interval)
+        super().__init__(
+            hass,
+            LOGGER,
+            name=DOMAIN,
+            update_interval=min(tier_intervals.values()),
+        )
+
+    def _due_tiers(self) -> frozenset[PollTier]:
+        now = monotonic()
+        # tolerate jitter of the refresh timer
+        slack = self.update_interval.total_seconds() / 2
+        return frozenset(
+            tier
+            for tier, interval in self.tier_intervals.items()
+            if tier not in self._tier_last_polled
+            or now - self._tier_last_polled[tier] + slack >= interval.total_seconds()
+        )
 
     async def _async_update_data(self):
         """Update data via library."""
+        tiers = self._due_tiers() if self.data is not None else frozenset(PollTier)
+        LOGGER.debug("updating tiers %s", sorted(tiers))
+
         try:
             async with timeout(self.timeout_delta.total_seconds()):
-                has_error, data = await self.heatpump.async_get_data()
+                has_error, data = await self.heatpump.async_get_data(tiers)
                 if has_error:
                     LOGGER.error("update partially failed")
-                return data
+                self._async_save_learned_state()
+                self.snapshot_store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
         except TimeoutError as e:
             LOGGER.error("timeout while updating")
             raise e
         except Exception as exception:
             raise exception
+        finally:
+            await self.async_write_frames()
+
+        now = monotonic()
+        for tier in tiers:
+            self._tier_last_polled[tier] = now
+
+        if self.data is None:
+            return data
+
+        # keep values of tiers that weren't due
+        data = {
+            **{
+                name: value
+                for name, value in self.data.items()
+                if self._sensor_tiers.get(name) not in tiers
+            },
+            **data,
+        }
+
+        self._changed_keys = {
+            name
+            for name in self.data.keys() | data.keys()
+            if name not in self.data
+            or name not in data
+            or self.data[name] != data[name]
+        }
+        return data
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners whose key changed in the last update.
+
+        Listeners without a context, and all listeners on the first update or
+        when the update started or stopped failing, are always notified.
+        """
+        changed_keys = self._changed_keys
+        self._changed_keys = None
+
+        if changed_keys is None or self._notified_success != self.last_update_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        suppressed = 0
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed_keys:
+                update_callback()
+            else:
+                suppressed += 1
+
+        self.suppressed_updates += suppressed
+        LOGGER.debug(
+            "%d keys changed, suppressed %d updates", len(changed_keys), suppressed
+        )
+
+    @callback
+    def async_update_disabled_sensors(self, entry_id: str):
+        """Read only sensors whose entities are enabled in the entity registry."""
+        registry = er.async_get(self.hass)
+        sensor_names = self.entity_tables.sensor_names
+        self.heatpump.set_disabled_sensors(
+            {
+                sensor_names[entity.unique_id]
+                for entity in er.async_entries_for_config_entry(registry, entry_id)
+                if entity.disabled_by is not None and entity.unique_id in sensor_names
+            }
+        )
+
+    @callback
+    def async_track_disabled_sensors(self, entry_id: str) -> CALLBACK_TYPE:
+        """Update the sensors to read when entities are enabled or disabled."""
+        registry = er.async_get(self.hass)
+
+        @callback
+        def _async_registry_updated(event: Event[er.EventEntityRegistryUpdatedData]):
+            if event.data["action"] == "update" and "disabled_by" not in event.data.get(
+                "changes", {}
+            ):
+                return
+            entity = registry.async_get(event.data["entity_id"])
+            if event.data["action"] == "remove" or (
+                entity is not None and entity.config_entry_id == entry_id
+            ):
+                self.async_update_disabled_sensors(entry_id)
+
+        self.async_update_disabled_sensors(entry_id)
+        return self.hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, _async_registry_updated
+        )
+
+    async def async_write_frames(self):
+        """Write raw frames recorded by the heat pump to disk."""
+        recorder = self.heatpump.frame_recorder
+        if recorder is not None:
+            await self.hass.async_add_executor_job(recorder.write, recorder.take())
+
+    async def async_load_learned_state(self):
+        """Restore what was learned about the heat pump in a previous run."""
+        state = await self.learned_store.async_load()
+        if state is not None:
+            LOGGER.debug("restoring learned state %s", state)
+            self.heatpump.restore_learned_state(state)
+
+    def _async_save_learned_state(self):
+        if self.heatpump.learned_state_changed:
+            self.heatpump.learned_state_changed = False
+            self.learned_store.async_delay_save(
+                self.heatpump.learned_state, STORAGE_SAVE_DELAY
+            )
+
+    def _snapshot(self) -> dict[str, any]:
+        time = self.last_update_success_time or dt_util.utcnow()
+        return {"time": time.isoformat(), "values": dict(self.data or {})}
+
+    async def async_save_snapshot(self):
+        """Save the current values immediately."""
+        if self.data is not None:
+            await self.snapshot_store.async_save(self._snapshot())
+
+    async def async_load_snapshot(self) -> bool:
+        """Restore the values saved in a previous run.
+
+        Returns whether values were restored. Snapshots older than
+        `SNAPSHOT_MAX_AGE` are ignored.
+        """
+        snapshot = await self.snapshot_store.async_load()
+        if snapshot is None:
+            return False
+
+        time = dt_util.parse_datetime(snapshot.get("time", ""))
+        if time is None or (dt_util.utcnow() - time).total_seconds() > SNAPSHOT_MAX_AGE:
+            LOGGER.debug("ignoring snapshot from %s", time)
+            return False
+
+        data = {}
+        for name, value in snapshot.get("values", {}).items():
+            sensor = self._sensors.get(name)
+            if sensor is None:
+                continue
+            try:
+                data[name] = sensor.restore_value(value)
+            except ValueError:
+                LOGGER.debug("cannot restore %s for %s", value, name)
+
+        if len(data) == 0:
+            return False
+
+        LOGGER.debug("restored %d values from %s", len(data), time)
+        self.data = data
+        self.last_update_success_time = time
+        return True
 
     async def async_write_value(self, address: BaseSensorAddress[_T], value: _T):
-        """Update data via library."""
+        """Write value via the write scheduler."""
+        await self.write_scheduler.async_write(address, value)
+
+    async def async_write_values(
+        self, values: list[tuple[BaseSensorAddress, any]]
+    ) -> list[Exception | None]:
+        """Write multiple values via the write scheduler.
+
+        Returns `None` or the error for each value, see
+        `IdmHeatpump.async_write_values`.
+        """
+        return await self.write_scheduler.async_write_values(values)
+
+    async def async_send_values(
+        self, values: list[tuple[BaseSensorAddress, any]]
+    ) -> list[Exception | None]:
+        """Write values immediately, bypassing the write scheduler."""
+        written: dict[str, any] = {}
         try:
             async with timeout(self.timeout_delta.total_seconds()):
-                await self.heatpump.async_write_value(address, value)
+                results = await self.heatpump.async_write_values(values)
+                written = {
+                    address.name: value
+                    for (address, value), error in zip(values, results, strict=True)
+                    if error is None
+                }
+
+                if self.verify_writes and written:
+                    # show what the heat pump accepted instead of the written values
+                    read_back = await self.heatpump.async_read_back(
+                        [address for address, _ in values if address.name in written]
+                    )
+                    for name, value in read_back.items():
+                        if value != written[name]:
+                            LOGGER.info(
+                                "heat pump reports %s for %s after writing %s",
+                                value,
+                                name,
+                                written[name],
+                            )
+                    written.update(read_back)
         except TimeoutError as e:
             LOGGER.error("timeout while writing")
-            raise e
-        except Exception as exception:
-            raise exception
+            if not written:
+                raise e
+
+        self.async_set_written(written)
+
+        return results
 
-        self.data[address.name] = value
+    @callback
+    def async_set_written(self, values: dict[str, any]):
+        """Store values written to the heat pump and notify their listeners."""
+        if self.data is None or not values:
+            return
+        self.data.update(values)
+        self._changed_keys = set(values)
+        self.async_update_listeners()
@@ -0,0 +1,41 @@
+"""Diagnostics support for idm_heatpump."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_HOSTNAME, DOMAIN
+from .coordinator import IdmHeatpumpDataUpdateCoordinator
+
+# the unique id of config entries is the hostname as well
+TO_REDACT = {CONF_HOSTNAME, "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: IdmHeatpumpDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "tier_intervals": {
+                tier.name: interval.total_seconds()
+                for tier, interval in coordinator.tier_intervals.items()
+            },
+            "suppressed_updates": coordinator.suppressed_updates,
+            "writes": coordinator.write_scheduler.as_dict(),
+            "verify_writes": coordinator.verify_writes,
+            "feed_in": (
+                coordinator.feed_in.as_dict()
+                if coordinator.feed_in is not None
+                else None
+            ),
+        },
+        "heatpump": coordinator.heatpump.diagnostics(),
+        "metrics": coordinator.heatpump.metrics.as_dict(),
+    }
@@ -0,0 +1,207 @@
+"""Probing of heat pumps and discovery of their heating circuits and zone modules."""
+
+import asyncio
+import struct
+import time
+from dataclasses import dataclass, field
+
+from pymodbus.exceptions import ModbusException
+
+from .connection import SharedConnection, acquire_connection, release_connection
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DISCOVERY_REQUEST_TIMEOUT,
+    FIRMWARE_VERSION_ADDRESS,
+    MAX_ROOM_COUNT,
+    MAX_ZONE_COUNT,
+    MODBUS_PORT,
+    PROBE_REQUEST_TIMEOUT,
+)
+from .logger import LOGGER
+from .pymodbus_compat import read_input_registers
+from .sensor_addresses import (
+    ROOM_OFFSETS,
+    SENSOR_ADDRESSES,
+    ZONE_OFFSETS,
+    HeatingCircuit,
+    ZoneModule,
+    heating_circuit_sensors,
+)
+
+_ABSENT_REGISTER = 0xFFFF
+
+
+@dataclass
+class DiscoveryResult:
+    """Heating circuits and zone modules found on a heat pump."""
+
+    circuits: list[HeatingCircuit] = field(default_factory=list)
+    zones: list[ZoneModule] = field(default_factory=list)
+    requests: int = 0
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of a quick connectivity check of a heat pump."""
+
+    reachable: bool = False
+    # mean seconds per answered request
+    latency: float | None = None
+    # raw firmware version registers, their format isn't documented
+    firmware: str | None = None
+    system_status: str | None = None
+    requests: int = 0
+
+
+def _is_absent(registers: list[int] | None) -> bool:
+    """Check if registers belong to a component that isn't installed."""
+    if registers is None or all(r == _ABSENT_REGISTER for r in registers):
+        return True
+    if len(registers) == 2:
+        return struct.unpack("<f", struct.pack("<2H", *registers))[0] == -1.0
+    return False
+
+
+class _Prober:
+    def __init__(
+        self, connection: SharedConnection, timeout: float = DISCOVERY_REQUEST_TIMEOUT
+    ) -> None:
+        self.connection = connection
+        self.timeout = timeout
+        self.requests = 0
+        self.answered = 0
+        self.seconds = 0.0
+
+    async def read(self, address: int, count: int) -> list[int] | None:
+        """Read registers, returns None if the controller didn't answer them."""
+        self.requests += 1
+        async with self.connection.window:
+            start = time.perf_counter()
+            try:
+                async with asyncio.timeout(self.timeout):
+                    result = await read_input_registers(
+                        self.connection.client, address=address, count=count
+                    )
+            except (TimeoutError, ModbusException) as error:
+                LOGGER.debug("probing %d (count=%d) failed: %s", address, count, error)
+                return None
+            self.answered += 1
+            self.seconds += time.perf_counter() - start
+
+        if result.isError():
+            LOGGER.debug("probing %d (count=%d) failed: %s", address, count, result)
+            return None
+        return result.registers
+
+    async def circuit(self, circuit: HeatingCircuit) -> bool:
+        sensors = {s.name: s for s in heating_circuit_sensors(circuit)}
+        flow = sensors[f"temp_flow_current_circuit_{circuit.name.lower()}"]
+        mode = sensors[f"mode_circuit_{circuit.name.lower()}"]
+        registers = await asyncio.gather(
+            self.read(flow.address, flow.size), self.read(mode.address, mode.size)
+        )
+        return not any(_is_absent(r) for r in registers)
+
+    async def zone(self, index: int) -> ZoneModule | None:
+        offset = ZONE_OFFSETS[index]
+        if _is_absent(await self.read(offset, 1)):
+            return None
+
+        # current temperature of each room, and the relay of room 9
+        *rooms, room_9_relay = await asyncio.gather(
+            *[
+                self.read(offset + ROOM_OFFSETS[room], 2)
+                for room in range(MAX_ROOM_COUNT)
+            ],
+            self.read(offset + 64, 1),
+        )
+        room_count = max(
+            (room + 1 for room, r in enumerate(rooms) if not _is_absent(r)),
+            default=1,
+        )
+        return ZoneModule(index, room_count, not _is_absent(room_9_relay))
+
+
+async def async_discover(hostname: str, port: int = MODBUS_PORT) -> DiscoveryResult:
+    """Find installed heating circuits and zone modules.
+
+    All circuits and zones are probed concurrently with a few small reads
+    each, limited by the request window of the connection. Components whose
+    registers read as 0xFFFF or -1, or can't be read at all, are considered
+    absent. Zones are numbered from the first one, so all zones up to the
+    last installed one are returned.
+    """
+    connection = acquire_connection(hostname, port, DEFAULT_MAX_CONCURRENT_REQUESTS)
+    try:
+        async with connection.connect_lock:
+            if not connection.client.connected:
+                await connection.async_connect()
+
+        prober = _Prober(connection)
+        circuits, zones = await asyncio.gather(
+            asyncio.gather(*[prober.circuit(c) for c in HeatingCircuit]),
+            asyncio.gather(*[prober.zone(i) for i in range(MAX_ZONE_COUNT)]),
+        )
+    finally:
+        release_connection(connection)
+
+    zone_count = max(
+        (i + 1 for i, zone in enumerate(zones) if zone is not None), default=0
+    )
+    result = DiscoveryResult(
+        circuits=[c for c, present in zip(HeatingCircuit, circuits) if present],
+        zones=[
+            zone if zone is not None else ZoneModule(i, 1, False)
+            for i, zone in enumerate(zones[:zone_count])
+        ],
+        requests=prober.requests,
+    )
+    LOGGER.debug("discovered %s", result)
+    return result
+
+
+async def async_probe(hostname: str, port: int = MODBUS_PORT) -> ProbeResult:
+    """Check that a heat pump answers at `hostname`.
+
+    Only the system status and, if it answered, the firmware version are read,
+    with a deadline of `PROBE_REQUEST_TIMEOUT` for connecting and for each
+    read. The connection is released right away, so that the controller isn't
+    kept busy by the config flow.
+    """
+    status_system = SENSOR_ADDRESSES["status_system"]
+    status = firmware = None
+
+    connection = acquire_connection(hostname, port, DEFAULT_MAX_CONCURRENT_REQUESTS)
+    prober = _Prober(connection, PROBE_REQUEST_TIMEOUT)
+    try:
+        async with connection.connect_lock:
+            connected = connection.client.connected
+            if not connected:
+                try:
+                    async with asyncio.timeout(PROBE_REQUEST_TIMEOUT):
+                        connected = await connection.async_connect()
+                except (TimeoutError, ModbusException, OSError) as error:
+                    LOGGER.debug("connecting to %s failed: %s", hostname, error)
+
+        if connected:
+            status = await prober.read(status_system.address, status_system.size)
+        if status is not None:
+            firmware = await prober.read(FIRMWARE_VERSION_ADDRESS, 2)
+    finally:
+        release_connection(connection)
+
+    result = ProbeResult(reachable=status is not None, requests=prober.requests)
+    if status is not None:
+        try:
+            available, value = status_system.decode(status)
+        except ValueError:
+            available = False
+        if available:
+            result.system_status = value.name
+    if firmware is not None and not _is_absent(firmware):
+        result.firmware = " ".join(f"{r:04x}" for r in firmware)
+    if prober.answered > 0:
+        result.latency = prober.seconds / prober.answered
+
+    LOGGER.debug("probed %s: %s", hostname, result)
+    return result
@@ -4,19 +4,9 @@ from abc import abstractmethod
 from typing import Generic, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import slugify
 
-from .const import (
-    CONF_DISPLAY_NAME,
-    CONF_HOSTNAME,
-    DOMAIN,
-    MANUFACTURER,
-    MODEL_MAIN,
-    MODEL_ZONE,
-    SensorFeatures,
-)
+from .const import DOMAIN, SensorFeatures
 from .coordinator import IdmHeatpumpDataUpdateCoordinator
 from .sensor_addresses import BaseSensorAddress
 
@@ -33,10 +23,16 @@ class IdmHeatpumpEntity(CoordinatorEntity, Generic[_T]):
         self,
         coordinator: IdmHeatpumpDataUpdateCoordinator,
         config_entry: ConfigEntry,
+        sensor_address: BaseSensorAddress[_T],
     ):
         """Create entity."""
-        super().__init__(coordinator)
+        # only notified by the coordinator when this sensor's value changed
+        super().__init__(coordinator, context=sensor_address.name)
         self.config_entry = config_entry
+        self.sensor_address = sensor_address
+        tables = coordinator.entity_tables
+        self._attr_unique_id = tables.unique_ids[self.sensor_id]
+        self._attr_device_info = tables.device_infos[self.sensor_id]
 
     @property
     @abstractmethod
@@ -48,31 +44,6 @@ class IdmHeatpumpEntity(CoordinatorEntity, Generic[_T]):
         """Return wether this sensor is available."""
         return self.sensor_address.name in self.coordinator.data
 
-    @property
-    def unique_id(self):
-        """Return a unique ID to use for this entity."""
-        return f"{slugify(self.config_entry.data.get(CONF_HOSTNAME))}_{self.sensor_id}"
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info."""
-        zone = self.sensor_address.zone_id
-        if zone is not None:
-            return DeviceInfo(
-                identifiers={(DOMAIN, f"{self.config_entry.entry_id}_zone_{zone+1}")},
-                name=f"{self.config_entry.data.get(CONF_DISPLAY_NAME)} Zone {zone+1}",
-                model=MODEL_ZONE,
-                manufacturer=MANUFACTURER,
-                via_device=(DOMAIN, self.config_entry.entry_id),
-            )
-
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.config_entry.entry_id)},
-            name=self.config_entry.data.get(CONF_DISPLAY_NAME),
-            model=MODEL_MAIN,
-            manufacturer=MANUFACTURER,
-        )
-
     @property
     def extra_state_attributes(self):
         """Return extra attributes."""
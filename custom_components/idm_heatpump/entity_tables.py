@@ -0,0 +1,69 @@
+"""Device info and unique ids of the entities of a config entry."""
+
+from collections.abc import Iterable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.util import slugify
+
+from .const import (
+    CONF_DISPLAY_NAME,
+    CONF_HOSTNAME,
+    DOMAIN,
+    MANUFACTURER,
+    MODEL_MAIN,
+    MODEL_ZONE,
+)
+from .sensor_addresses import BaseSensorAddress
+
+
+def main_device_info(config_entry: ConfigEntry) -> DeviceInfo:
+    """Return device info of the heat pump itself."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, config_entry.entry_id)},
+        name=config_entry.data.get(CONF_DISPLAY_NAME),
+        model=MODEL_MAIN,
+        manufacturer=MANUFACTURER,
+    )
+
+
+def zone_device_info(config_entry: ConfigEntry, zone: int) -> DeviceInfo:
+    """Return device info of a zone module."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{config_entry.entry_id}_zone_{zone + 1}")},
+        name=f"{config_entry.data.get(CONF_DISPLAY_NAME)} Zone {zone + 1}",
+        model=MODEL_ZONE,
+        manufacturer=MANUFACTURER,
+        via_device=(DOMAIN, config_entry.entry_id),
+    )
+
+
+class EntityTables:
+    """Unique id and device info of every sensor of a config entry.
+
+    The tables are built once with the sensors of the heat pump. Entities of
+    the same device share one `DeviceInfo`, and entities, the coordinator and
+    registry updates only look values up instead of computing them again.
+    """
+
+    def __init__(
+        self, config_entry: ConfigEntry, sensors: Iterable[BaseSensorAddress]
+    ) -> None:
+        """Build tables for the given sensors."""
+        self.unique_id_prefix = f"{slugify(config_entry.data.get(CONF_HOSTNAME))}_"
+        # device info by zone, None is the heat pump itself
+        self.devices: dict[int | None, DeviceInfo] = {
+            None: main_device_info(config_entry)
+        }
+        self.device_infos: dict[str, DeviceInfo] = {}
+        self.unique_ids: dict[str, str] = {}
+        self.sensor_names: dict[str, str] = {}
+
+        for sensor in sensors:
+            zone = sensor.zone_id
+            if zone not in self.devices:
+                self.devices[zone] = zone_device_info(config_entry, zone)
+            unique_id = self.unique_id_prefix + sensor.name
+            self.device_infos[sensor.name] = self.devices[zone]
+            self.unique_ids[sensor.name] = unique_id
+            self.sensor_names[unique_id] = sensor.name
@@ -0,0 +1,199 @@
+"""Feed-in of PV and battery values from Home Assistant entities."""
+
+import asyncio
+from datetime import timedelta
+
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    PERCENTAGE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfPower,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.util.unit_conversion import PowerConverter
+
+from .const import FEED_IN_WINDOW, SensorFeatures
+from .logger import LOGGER
+from .sensor_addresses import SENSOR_ADDRESSES, IdmSensorAddress
+from .write_scheduler import WriteScheduler, WriteValues
+
+
+class FeedInPipeline:
+    """Pushes the states of source entities to the registers of the heat pump.
+
+    Every state change of a source is converted to the unit of its target
+    register and handed to a dedicated `WriteScheduler`, which batches values
+    arriving within `FEED_IN_WINDOW`, applies the deadbands and writes each
+    register at most once per `min_interval`. All sources are written again
+    every `heartbeat`, regardless of the deadband, so that the heat pump never
+    considers them outdated.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write: WriteValues,
+        sources: dict[str, str],
+        min_interval: float,
+        power_deadband: float,
+        battery_deadband: float,
+        heartbeat: timedelta,
+    ) -> None:
+        """Create pipeline writing the source entity of each target sensor."""
+        self.hass = hass
+        self.sources: dict[str, list[IdmSensorAddress]] = {}
+        for target, entity_id in sources.items():
+            self.sources.setdefault(entity_id, []).append(SENSOR_ADDRESSES[target])
+        self.power_deadband = power_deadband
+        self.battery_deadband = battery_deadband
+        self.heartbeat = heartbeat
+        self.scheduler = WriteScheduler(
+            write,
+            window=FEED_IN_WINDOW,
+            min_interval=min_interval,
+        )
+        self._unsubscribe: list[CALLBACK_TYPE] = []
+        # feeds that haven't finished yet, cancelled when stopping
+        self._tasks: set[asyncio.Task] = set()
+
+    def _convert(self, state: State, target: IdmSensorAddress) -> float | int | None:
+        if state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+
+        try:
+            value = float(state.state)
+        except ValueError:
+            LOGGER.warning(
+                "cannot feed in non-numeric state %s of %s",
+                state.state,
+                state.entity_id,
+            )
+            return None
+
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        if target.unit == UnitOfPower.KILO_WATT:
+            if unit not in PowerConverter.VALID_UNITS:
+                LOGGER.warning(
+                    "cannot feed in %s of %s as power", unit, state.entity_id
+                )
+                return None
+            value = PowerConverter.convert(value, unit, UnitOfPower.KILO_WATT)
+        elif target.unit == PERCENTAGE and unit not in (PERCENTAGE, None):
+            LOGGER.warning(
+                "cannot feed in %s of %s as percentage", unit, state.entity_id
+            )
+            return None
+
+        if target.min_value is not None:
+            value = max(value, target.min_value)
+        if target.max_value is not None:
+            value = min(value, target.max_value)
+
+        if SensorFeatures.SET_BATTERY in target.supported_features:
+            return round(value)
+        return value
+
+    async def _async_feed(
+        self, state: State, target: IdmSensorAddress, force: bool = False
+    ):
+        value = self._convert(state, target)
+        if value is None:
+            return
+
+        deadband = (
+            self.battery_deadband
+            if SensorFeatures.SET_BATTERY in target.supported_features
+            else self.power_deadband
+        )
+        try:
+            await self.scheduler.async_write(
+                target, value, deadband=0.0 if force else deadband
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            LOGGER.warning(
+                "feeding %s from %s to %s failed: %s",
+                value,
+                state.entity_id,
+                target.name,
+                error,
+            )
+
+    @callback
+    def _async_start_feed(
+        self, state: State, target: IdmSensorAddress, force: bool = False
+    ):
+        task = self.hass.async_create_task(self._async_feed(state, target, force))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]):
+        state = event.data["new_state"]
+        if state is None:
+            return
+        for target in self.sources[state.entity_id]:
+            self._async_start_feed(state, target)
+
+    @callback
+    def _async_heartbeat(self, _now=None):
+        for entity_id, targets in self.sources.items():
+            state = self.hass.states.get(entity_id)
+            if state is None:
+                continue
+            for target in targets:
+                self._async_start_feed(state, target, force=True)
+
+    @callback
+    def async_start(self):
+        """Subscribe to the source entities and write their current states."""
+        LOGGER.debug("feeding in %s", self._source_names())
+        self._unsubscribe = [
+            async_track_state_change_event(
+                self.hass, list(self.sources), self._async_state_changed
+            ),
+            async_track_time_interval(self.hass, self._async_heartbeat, self.heartbeat),
+        ]
+        self._async_heartbeat()
+
+    async def async_stop(self):
+        """Unsubscribe and write pending values."""
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        self._unsubscribe = []
+
+        # values the feeds already handed to the scheduler are still written
+        # by the shutdown, feeds that didn't start yet are dropped
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        await self.scheduler.async_shutdown()
+
+    def _source_names(self) -> dict[str, list[str]]:
+        return {
+            entity_id: [target.name for target in targets]
+            for entity_id, targets in self.sources.items()
+        }
+
+    def as_dict(self) -> dict[str, any]:
+        """Return sources and counters for diagnostics."""
+        return {
+            "sources": self._source_names(),
+            "power_deadband": self.power_deadband,
+            "battery_deadband": self.battery_deadband,
+            "heartbeat": self.heartbeat.total_seconds(),
+            "writes": self.scheduler.as_dict(),
+        }
@@ -0,0 +1,103 @@
+"""Recording of raw register frames read from the heat pump.
+
+Files start with `FILE_MAGIC` followed by records of a little endian header
+(timestamp as double, start address and register count as uint16) and the
+registers as uint16. A record without registers marks the start of a cycle.
+"""
+
+import os
+import struct
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+FILE_MAGIC = b"IDMFRAMES1"
+
+_RECORD_HEADER = struct.Struct("<dHH")
+
+
+@dataclass(frozen=True)
+class RecordedFrame:
+    """Registers read in one request, or the start of a cycle if empty."""
+
+    timestamp: float
+    start: int
+    registers: tuple[int, ...]
+
+
+class FrameRecorder:
+    """Append-only, rotating recorder of raw register frames.
+
+    Frames are collected in memory by `record` on the event loop, `take`
+    hands them over to `write`, which does the blocking file I/O and must
+    run in an executor.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int) -> None:
+        """Create recorder writing to `path`."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._buffer = bytearray()
+
+    def start_cycle(self):
+        """Mark the start of a poll cycle."""
+        self._buffer += _RECORD_HEADER.pack(time.time(), 0, 0)
+
+    def record(self, start: int, registers: list[int]):
+        """Record registers read starting at `start`."""
+        self._buffer += _RECORD_HEADER.pack(time.time(), start, len(registers))
+        self._buffer += struct.pack(f"<{len(registers)}H", *registers)
+
+    def take(self) -> bytes:
+        """Take the frames recorded since the last call."""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+    def write(self, data: bytes):
+        """Append frames returned by `take` to the file, rotating it if needed."""
+        if len(data) == 0:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        if (
+            os.path.exists(self.path)
+            and os.path.getsize(self.path) + len(data) > self.max_bytes
+        ):
+            self._rotate()
+
+        with open(self.path, "ab") as file:
+            if file.tell() == 0:
+                file.write(FILE_MAGIC)
+            file.write(data)
+
+    def _rotate(self):
+        for i in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+def read_frames(path: str) -> Iterator[RecordedFrame]:
+    """Read all frames of a file written by `FrameRecorder`."""
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if not data.startswith(FILE_MAGIC):
+        raise ValueError(f"{path} is not a frame recording")
+
+    offset = len(FILE_MAGIC)
+    while offset + _RECORD_HEADER.size <= len(data):
+        timestamp, start, count = _RECORD_HEADER.unpack_from(data, offset)
+        offset += _RECORD_HEADER.size
+        if offset + 2 * count > len(data):
+            # truncated by a crash while writing
+            return
+        registers = struct.unpack_from(f"<{count}H", data, offset)
+        offset += 2 * count
+        yield RecordedFrame(timestamp, start, registers)
@@ -0,0 +1,152 @@
+"""Planning of grouped register reads."""
+
+import struct
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain, pairwise
+
+from .sensor_addresses import BaseSensorAddress
+
+
+@dataclass
+class SensorGroup:
+    """Range of registers that is read with a single request."""
+
+    start: int
+    count: int
+    sensors: list[BaseSensorAddress]
+
+    @staticmethod
+    def single(sensor: BaseSensorAddress) -> "SensorGroup":
+        """Create a group that only contains a single sensor."""
+        return SensorGroup(start=sensor.address, count=sensor.size, sensors=[sensor])
+
+    @property
+    def has_gaps(self) -> bool:
+        """Check whether the group contains registers without a sensor."""
+        # sensors may overlap, so the sizes of the sensors don't add up to the count
+        return any(a.address + a.size < b.address for a, b in pairwise(self.sensors))
+
+    @cached_property
+    def key(self) -> tuple[int, ...]:
+        """Identify the registers and sensors of this group across plans."""
+        return (self.start, self.count, *(s.address for s in self.sensors))
+
+    @cached_property
+    def _registers_format(self) -> struct.Struct:
+        return struct.Struct(f"<{self.count}H")
+
+    @cached_property
+    def _values_formats(self) -> list[tuple[int, struct.Struct]]:
+        # registers are packed as little endian words, so multi-register values
+        # with the low word first unpack directly; gaps are skipped as padding
+        # and a sensor overlapping the previous one starts a new format
+        formats: list[tuple[int, struct.Struct]] = []
+        offset = position = self.start
+        fmt = "<"
+        for sensor in self.sensors:
+            if sensor.address < position:
+                formats.append((2 * (offset - self.start), struct.Struct(fmt)))
+                offset = position = sensor.address
+                fmt = "<"
+            if sensor.address > position:
+                fmt += f"{2 * (sensor.address - position)}x"
+            fmt += sensor.struct_format
+            position = sensor.address + sensor.size
+        formats.append((2 * (offset - self.start), struct.Struct(fmt)))
+        return formats
+
+    def unpack(self, registers: list[int]) -> tuple:
+        """Unpack the raw values of all sensors from the registers of this group."""
+        if len(registers) != self.count:
+            raise ValueError(f"expected {self.count} registers, got {len(registers)}")
+        buffer = self._registers_format.pack(*registers)
+        return tuple(
+            chain.from_iterable(
+                fmt.unpack_from(buffer, offset) for offset, fmt in self._values_formats
+            )
+        )
+
+
+@dataclass(frozen=True)
+class RequestCostModel:
+    """Estimated cost (in ms) of reading registers from the heat pump."""
+
+    request_cost: float
+    register_cost: float
+
+    def cost(self, count: int) -> float:
+        """Get the cost of a single request reading `count` registers."""
+        return self.request_cost + count * self.register_cost
+
+
+def plan_groups(
+    sensors: Sequence[BaseSensorAddress],
+    cost_model: RequestCostModel,
+    max_count: int,
+    no_bridge: Collection[int] = (),
+    isolated: Collection[int] = (),
+) -> list[SensorGroup]:
+    """Split sensors into groups with minimal total request cost.
+
+    Sensors must be sorted by address. Gaps between sensors are read (and
+    discarded) when that is cheaper than starting a new request. Groups never
+    exceed `max_count` registers, sensors with `force_single` are always read
+    alone and the gap directly after any address in `no_bridge` is never read.
+
+    Sensors with an address in `isolated` are read alone as well, but other
+    groups may still read across their registers like across any other gap.
+    """
+
+    grouped = [s for s in sensors if s.address not in isolated]
+
+    # best[i] = (cost, start index of last group) for the first i sensors
+    best: list[tuple[float, int]] = [(0.0, 0)]
+
+    for end, last in enumerate(grouped):
+        end_address = last.address + last.size
+
+        candidates = [(best[end][0] + cost_model.cost(last.size), end)]
+        if not last.force_single:
+            for start in range(end - 1, -1, -1):
+                first = grouped[start]
+                if (
+                    first.force_single
+                    or end_address - first.address > max_count
+                    or (
+                        first.address + first.size != grouped[start + 1].address
+                        and first.address in no_bridge
+                    )
+                ):
+                    break
+
+                candidates.append(
+                    (
+                        best[start][0] + cost_model.cost(end_address - first.address),
+                        start,
+                    )
+                )
+
+        best.append(min(candidates))
+
+    groups = [
+        SensorGroup.single(sensor) for sensor in sensors if sensor.address in isolated
+    ]
+    end = len(grouped)
+    while end > 0:
+        start = best[end][1]
+        group_sensors = grouped[start:end]
+        groups.append(
+            SensorGroup(
+                start=group_sensors[0].address,
+                count=group_sensors[-1].address
+                + group_sensors[-1].size
+                - group_sensors[0].address,
+                sensors=group_sensors,
+            )
+        )
+        end = start
+
+    groups.sort(key=lambda group: group.start)
+    return groups
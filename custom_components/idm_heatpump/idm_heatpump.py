@@ -2,22 +2,39 @@
 
 import asyncio
 import collections
-from dataclasses import dataclass
-from inspect import signature
+import fnmatch
+import time
+from collections.abc import Collection, Mapping
+from datetime import timedelta
 from typing import TypeVar
 
 from pymodbus.client import AsyncModbusTcpClient
 from pymodbus.exceptions import ConnectionException, ModbusException
 
-try:
-    from pymodbus.pdu.register_message import ReadInputRegistersResponse
-except ImportError:
-    from pymodbus.pdu.register_read_message import (  # pyright: ignore[reportMissingImports]
-        ReadInputRegistersResponse,
-    )
-
-from .const import NAME_POWER_USAGE
+from .connection import SharedConnection, acquire_connection, release_connection
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_GROUP_SIZE,
+    DEFAULT_REGISTER_COST,
+    DEFAULT_REQUEST_COST,
+    DEFAULT_REQUEST_DEADLINE,
+    ISOLATION_THRESHOLD,
+    MODBUS_MAX_READ_COUNT,
+    MODBUS_MAX_WRITE_COUNT,
+    MODBUS_PORT,
+    NAME_POWER_USAGE,
+    SPLIT_THRESHOLD,
+    PollTier,
+)
+from .frame_recorder import FrameRecorder
+from .group_planner import RequestCostModel, SensorGroup, plan_groups
 from .logger import LOGGER
+from .metrics import HeatpumpMetrics
+from .pymodbus_compat import (
+    ReadInputRegistersResponse,
+    read_input_registers,
+    write_registers,
+)
 from .sensor_addresses import (
     BINARY_SENSOR_ADDRESSES,
     SENSOR_ADDRESSES,
@@ -29,24 +46,79 @@ from .sensor_addresses import (
 
 _T = TypeVar("_T")
 
+ALL_POLL_TIERS = frozenset(PollTier)
+
+
+DEFAULT_COST_MODEL = RequestCostModel(
+    request_cost=DEFAULT_REQUEST_COST,
+    register_cost=DEFAULT_REGISTER_COST,
+)
+
 
 class _FetchError(Exception):
     pass
 
 
+def _poll_tiers(
+    sensors: list[BaseSensorAddress],
+    tier_sensors: Mapping[PollTier, Collection[str]],
+) -> dict[str, PollTier]:
+    """Get the tier of every sensor, `tier_sensors` overrides the defaults.
+
+    Overrides are sensor names or patterns like `curve_circuit_*`, if a sensor
+    matches the overrides of several tiers the fastest one is used.
+    """
+    tiers = {s.name: s.poll_tier for s in sensors}
+    for tier in sorted(tier_sensors, reverse=True):
+        for pattern in tier_sensors[tier]:
+            for name in fnmatch.filter(tiers, pattern):
+                tiers[name] = tier
+    return tiers
+
+
+def _merge_writes(
+    writes: list[tuple[int, int, list[int]]],
+) -> list[tuple[int, list[int], list[int]]]:
+    """Merge writes of contiguous registers.
+
+    `writes` contains (index, address, registers) tuples. Returns (address,
+    registers, indices) tuples for a `write_registers` transaction each.
+    Writes overlapping a previous write are never merged, so that the later
+    value is written last.
+    """
+    merged: list[tuple[int, list[int], list[int]]] = []
+    for index, address, registers in sorted(writes, key=lambda w: w[1]):
+        if merged:
+            start, previous, indices = merged[-1]
+            if (
+                start + len(previous) == address
+                and len(previous) + len(registers) <= MODBUS_MAX_WRITE_COUNT
+            ):
+                previous.extend(registers)
+                indices.append(index)
+                continue
+        merged.append((address, list(registers), [index]))
+    return merged
+
+
 class IdmHeatpump:
     """Abstraction over the modbus interface of IDM heatpumps."""
 
-    @dataclass
-    class _SensorGroup:
-        start: int
-        count: int
-        sensors: list[BaseSensorAddress]
-
+    connection: SharedConnection
     client: AsyncModbusTcpClient
     sensors: list[BaseSensorAddress]
-    sensor_groups: list[_SensorGroup] = []
+    sensor_tiers: dict[str, PollTier]
+    sensor_groups: list[SensorGroup]
     max_power_usage: float | None
+    no_groups: bool
+    cost_model: RequestCostModel
+    max_group_size: int
+    learned_state_changed: bool
+    request_deadline: timedelta
+    max_concurrent_requests: int
+    decode_seconds: float
+    metrics: HeatpumpMetrics
+    frame_recorder: FrameRecorder | None
 
     def __init__(
         self,
@@ -55,11 +127,45 @@ class IdmHeatpump:
         zones: list[ZoneModule],
         no_groups: bool,
         max_power_usage: float | None,
+        cost_model: RequestCostModel = DEFAULT_COST_MODEL,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        request_deadline: timedelta = timedelta(**DEFAULT_REQUEST_DEADLINE),
+        port: int = MODBUS_PORT,
+        tier_sensors: Mapping[PollTier, Collection[str]] | None = None,
     ) -> None:
         """Create heatpump."""
-        self.client = AsyncModbusTcpClient(host=hostname)
-
+        self.connection = acquire_connection(hostname, port, max_concurrent_requests)
+        self.client = self.connection.client
+
+        # limits the number of outstanding transactions of all users of the
+        # connection, waiting requests are sent in the order of the group plan
+        self._window = self.connection.window
+        self.max_concurrent_requests = max_concurrent_requests
+        self.request_deadline = request_deadline
         self.max_power_usage = max_power_usage
+        self.no_groups = no_groups
+        self.cost_model = cost_model
+        self.max_group_size = DEFAULT_MAX_GROUP_SIZE
+        self.learned_state_changed = False
+        # time spent decoding registers, without the refetches
+        self.decode_seconds = 0.0
+        self.metrics = HeatpumpMetrics()
+        self.frame_recorder = None
+        self._group_size_ceiling = MODBUS_MAX_READ_COUNT
+        self._group_size_probe: int | None = None
+        # tier sets whose groups wouldn't get larger with a larger group size
+        self._group_size_probe_useless: set[frozenset[PollTier]] = set()
+        self._no_bridge: set[int] = set()
+        self._isolated: set[int] = set()
+        self._group_failures: dict[int, int] = {}
+        # consecutive failed reads of groups with gaps or above the group size
+        self._split_failures: dict[tuple[int, ...], int] = {}
+        # names of sensors whose entities are disabled, these are never read
+        self._disabled: set[str] = set()
+        # registers of the last read of each group and the values decoded from
+        # them by `SensorGroup.key`, kept across replans which repeat most groups
+        self._frames: dict[tuple[int, ...], tuple[list[int], dict[str, any]]] = {}
+        self._tier_plans: dict[frozenset[PollTier], list[SensorGroup]] = {}
 
         self.sensors = sorted(
             [
@@ -82,81 +188,258 @@ class IdmHeatpump:
                 f"duplicate address(es) detected: {duplicate_addresses}"
             )
 
-        if no_groups:
-            self.sensor_groups = [
-                IdmHeatpump._SensorGroup(
-                    start=sensor.address,
-                    count=sensor.size,
-                    sensors=[sensor],
-                )
-                for sensor in self.sensors
-            ]
+        self.sensor_tiers = _poll_tiers(self.sensors, tier_sensors or {})
+
+        self._plan_groups()
+
+    def learned_state(self) -> dict[str, any]:
+        """Get the information learned about the heat pump for persisting it."""
+        return {
+            "max_group_size": self.max_group_size,
+            "max_group_size_ceiling": self._group_size_ceiling,
+            "isolated": sorted(self._isolated),
+        }
+
+    def diagnostics(self) -> dict[str, any]:
+        """Get the connection state, learned limits and plans for diagnostics."""
+        return {
+            "connection": {
+                "connected": self.client.connected,
+                "connects": self.connection.connects,
+                "reconnects": self.connection.reconnects,
+                "max_concurrent_requests": self.max_concurrent_requests,
+                "request_deadline": self.request_deadline.total_seconds(),
+            },
+            "learned": {
+                **self.learned_state(),
+                "group_size_probe": self._group_size_probe,
+                "no_bridge": sorted(self._no_bridge),
+                "group_failures": sorted(self._group_failures.items()),
+                "split_failures": [
+                    [start, count, failures]
+                    for (start, count, *_), failures in self._split_failures.items()
+                ],
+            },
+            "no_groups": self.no_groups,
+            "cost_model": {
+                "request_cost": self.cost_model.request_cost,
+                "register_cost": self.cost_model.register_cost,
+            },
+            "plans": [
+                {
+                    "tiers": [tier.name for tier in sorted(tiers)],
+                    "groups": [
+                        {
+                            "start": group.start,
+                            "count": group.count,
+                            "sensors": [sensor.name for sensor in group.sensors],
+                        }
+                        for group in plan
+                    ],
+                }
+                for tiers, plan in self._tier_plans.items()
+            ],
+            "disabled": sorted(self._disabled),
+            "decode_seconds": self.decode_seconds,
+        }
+
+    def restore_learned_state(self, state: dict[str, any]):
+        """Restore information returned by `learned_state`."""
+        self._group_size_ceiling = min(
+            state.get("max_group_size_ceiling", MODBUS_MAX_READ_COUNT),
+            MODBUS_MAX_READ_COUNT,
+        )
+        self.max_group_size = min(
+            state.get("max_group_size", DEFAULT_MAX_GROUP_SIZE),
+            self._group_size_ceiling,
+        )
+        self._group_size_probe = None
+        self._group_size_probe_useless.clear()
+        self._isolated = set(state.get("isolated", []))
+        self._plan_groups()
+
+    def _record_group_failure(self, sensor: BaseSensorAddress):
+        """Record that sensor could only be decoded when read on its own."""
+        failures = self._group_failures.get(sensor.address, 0) + 1
+        if failures < ISOLATION_THRESHOLD:
+            self._group_failures[sensor.address] = failures
+            return
+
+        LOGGER.info(
+            "%s failed to decode in %d consecutive group reads, reading it separately from now on",
+            sensor.name,
+            failures,
+        )
+        self._group_failures.pop(sensor.address, None)
+        self._isolated.add(sensor.address)
+        self._group_size_probe_useless.clear()
+        self.learned_state_changed = True
+        self._plan_groups()
+
+    def set_disabled_sensors(self, names: set[str]):
+        """Stop reading the given sensors, and start reading all others again."""
+        if names == self._disabled:
+            return
+
+        LOGGER.debug("not reading disabled sensors %s", sorted(names))
+        self._disabled = set(names)
+        self._group_size_probe_useless.clear()
+        self._plan_groups()
+
+    def _plan_groups(self):
+        # metrics of split parts, refetches and outdated plans are dropped,
+        # those of the previous plans are kept until their tiers are due again
+        keep = {
+            (group.start, group.count)
+            for plan in self._tier_plans.values()
+            for group in plan
+        }
+        self._tier_plans = {}
+        self.sensor_groups = self.plan_for(ALL_POLL_TIERS)
+        keep.update((group.start, group.count) for group in self.sensor_groups)
+        self.metrics.prune(keep)
+
+    def plan_for(self, tiers: frozenset[PollTier]) -> list[SensorGroup]:
+        """Get the groups to read all sensors of the given tiers."""
+        plan = self._tier_plans.get(tiers)
+        if plan is None:
+            plan = self._tier_plans[tiers] = self._plan(
+                tiers, self._group_size_probe or self.max_group_size
+            )
+        return plan
+
+    def _plan(self, tiers: frozenset[PollTier], max_count: int) -> list[SensorGroup]:
+        sensors = [
+            s
+            for s in self.sensors
+            if self.sensor_tiers[s.name] in tiers and s.name not in self._disabled
+        ]
+        if self.no_groups:
+            plan = [SensorGroup.single(sensor) for sensor in sensors]
         else:
-            for sensor in self.sensors:
-                last_address = (
-                    None
-                    if len(self.sensor_groups) == 0
-                    else self.sensor_groups[-1].start + self.sensor_groups[-1].count
-                )
+            plan = plan_groups(
+                sensors,
+                cost_model=self.cost_model,
+                max_count=max_count,
+                no_bridge=self._no_bridge,
+                isolated=self._isolated,
+            )
+
+        LOGGER.debug(
+            "planned %d requests for %d sensors in tiers %s",
+            len(plan),
+            len(sensors),
+            sorted(tiers),
+        )
+        return plan
+
+    def _start_group_size_probe(self, tiers: frozenset[PollTier]):
+        if (
+            self.no_groups
+            or self._group_size_probe is not None
+            or tiers in self._group_size_probe_useless
+            or self.max_group_size >= self._group_size_ceiling
+        ):
+            return
+
+        probe = (self.max_group_size + self._group_size_ceiling + 1) // 2
+        if all(
+            group.count <= self.max_group_size for group in self._plan(tiers, probe)
+        ):
+            # larger reads don't help with the current sensors
+            self._group_size_probe_useless.add(tiers)
+            return
+
+        self._group_size_probe = probe
+        self._plan_groups()
+
+        LOGGER.debug(
+            "trying to read up to %d registers at once", self._group_size_probe
+        )
 
-                if (
-                    # first group
-                    len(self.sensor_groups) == 0
-                    # group sensors to at most 32 registers
-                    or self.sensor_groups[-1].count + sensor.size > 32
-                    # start new group when forced
-                    or sensor.force_single
-                    or self.sensor_groups[-1].sensors[-1].force_single
-                    # not contiouus need new group
-                    or sensor.address != last_address
-                ):
-                    self.sensor_groups.append(
-                        IdmHeatpump._SensorGroup(
-                            start=sensor.address,
-                            count=sensor.size,
-                            sensors=[sensor],
-                        )
+    def _finish_group_size_probe(self, groups: list[SensorGroup], success: bool):
+        if self._group_size_probe is None:
+            return
+
+        if not success:
+            # inconclusive, try again in the next cycle
+            self._group_size_probe = None
+            self._plan_groups()
+            return
+
+        # all groups of the probe were read without errors
+        self.max_group_size = max(group.count for group in groups)
+        self._group_size_probe = None
+        self._group_size_probe_useless.clear()
+        self.learned_state_changed = True
+        self._plan_groups()
+
+        LOGGER.info("heat pump accepts reads of %d registers", self.max_group_size)
+
+    async def _connect(self):
+        async with self.connection.connect_lock:
+            # another user of the connection may have connected in the meantime
+            if self.client.connected:
+                return
+            await self.client.connect()
+            self.connection.connects += 1
+
+    def close(self):
+        """Release the connection to the heat pump."""
+        release_connection(self.connection)
+
+    async def _fetch_registers(self, group: SensorGroup) -> ReadInputRegistersResponse:
+        async with self._window:
+            LOGGER.debug("reading registers %d (count=%d)", group.start, group.count)
+            start = time.perf_counter()
+            try:
+                async with asyncio.timeout(self.request_deadline.total_seconds()):
+                    result = await read_input_registers(
+                        self.client,
+                        address=group.start,
+                        count=group.count,
                     )
+            except (asyncio.exceptions.TimeoutError, ModbusException) as error:
+                metrics = self.metrics.group(group.start, group.count)
+                if isinstance(error, ModbusException):
+                    metrics.record_error(time.perf_counter() - start)
                 else:
-                    self.sensor_groups[-1] = IdmHeatpump._SensorGroup(
-                        start=self.sensor_groups[-1].start,
-                        count=self.sensor_groups[-1].count + sensor.size,
-                        sensors=[*self.sensor_groups[-1].sensors, sensor],
-                    )
+                    metrics.record_timeout(time.perf_counter() - start)
+                raise
 
-    async def _fetch_registers(self, group: _SensorGroup) -> ReadInputRegistersResponse:
-        LOGGER.debug("reading registers %d (count=%d)", group.start, group.count)
-        if "device_id" in signature(self.client.read_input_registers).parameters:
-            return await self.client.read_input_registers(
-                address=group.start,
-                count=group.count,
-                device_id=1,
-            )
+        # looked up after the request, a replan in the meantime may prune it
+        metrics = self.metrics.group(group.start, group.count)
+        if result.isError():
+            metrics.record_error(time.perf_counter() - start)
         else:
-            return await self.client.read_input_registers(  # pylint: disable=unexpected-keyword-arg
-                address=group.start,
-                count=group.count,
-                slave=1,
-            )
+            metrics.record_success(time.perf_counter() - start, result.registers)
+            if self.frame_recorder is not None:
+                self.frame_recorder.record(group.start, result.registers)
+        return result
 
-    async def _fetch_retry(self, group: _SensorGroup) -> ReadInputRegistersResponse:
+    async def _fetch_retry(self, group: SensorGroup) -> ReadInputRegistersResponse:
         try:
             return await self._fetch_registers(group)
         except ConnectionException:
             if not self.client.connected:
-                await self.client.connect()
+                await self._connect()
             return await self._fetch_registers(group)
         except asyncio.exceptions.TimeoutError:
             if not self.client.connected:
-                await self.client.connect()
+                await self._connect()
             return await self._fetch_registers(group)
 
-    async def _fetch_sensors(self, group: _SensorGroup) -> dict[str, any]:
+    async def _fetch_sensors(
+        self, group: SensorGroup, retry_split: bool = True
+    ) -> dict[str, any]:
         LOGGER.debug("fetching registers from %d (count=%d)", group.start, group.count)
 
         try:
             result = await self._fetch_retry(group)
         except ModbusException as exception:
+            if group.count > self.max_group_size:
+                return await self._fetch_split(group, exception, retry_split)
+
             LOGGER.warning(
                 "Failed to fetch registers for group %d (count=%d): %s",
                 group.start,
@@ -166,6 +449,9 @@ class IdmHeatpump:
             raise _FetchError() from exception
 
         if result.isError():
+            if group.count > self.max_group_size or group.has_gaps:
+                return await self._fetch_split(group, result, retry_split)
+
             LOGGER.warning(
                 "Failed to fetch registers for group %d (count=%d): %s",
                 group.start,
@@ -175,61 +461,79 @@ class IdmHeatpump:
             raise _FetchError()
 
         LOGGER.debug("got registers %d", group.start)
+        if self._split_failures:
+            self._split_failures.pop(group.key, None)
 
         data: dict[str, any] = {}
 
         def decode_single(
             sensor: BaseSensorAddress,
             result: ReadInputRegistersResponse,
-        ):
+        ) -> bool:
             try:
                 available, value = sensor.decode(result.registers)
                 if available:
                     data[sensor.name] = value
+                return True
             except ValueError as single_error:
                 # if decoding fails (again) set to None (unknown)
+                self.metrics.group(group.start, group.count).decode_failures += 1
                 LOGGER.debug(
                     "decode failed for %s after single fetch",
                     sensor.name,
                     exc_info=single_error,
                 )
                 data[sensor.name] = None
+                return False
+
+        frame = self._frames.get(group.key)
+        unchanged = frame is not None and result.registers == frame[0]
+        failed: list[BaseSensorAddress] = []
+
+        decode_start = time.perf_counter()
+        if unchanged:
+            LOGGER.debug("registers %d unchanged, skipping decode", group.start)
+            data.update(frame[1])
+        elif len(group.sensors) == 1:
+            # single sensor -> don't do refetch on error
+            decode_single(group.sensors[0], result)
+        else:
+            try:
+                raw_values = group.unpack(result.registers)
+            except ValueError as error:
+                LOGGER.warning(
+                    "Failed to decode registers for group %d (count=%d): %s",
+                    group.start,
+                    group.count,
+                    error,
+                )
+                raise _FetchError() from error
 
-        try:
-            LOGGER.debug("got decoder %d", group.start)
+            for sensor, raw_value in zip(group.sensors, raw_values):
+                try:
+                    available, value = sensor.decode_value(raw_value)
+                    if available:
+                        data[sensor.name] = value
+                    self._group_failures.pop(sensor.address, None)
+                except ValueError as error:
+                    LOGGER.debug(
+                        "decode failed for %s, retrying with single fetch",
+                        sensor.name,
+                        exc_info=error,
+                    )
+                    failed.append(sensor)
+        self.decode_seconds += time.perf_counter() - decode_start
 
-            if len(group.sensors) == 1:
-                # single sensor -> don't do refetch on error
-                decode_single(group.sensors[0], result)
-            else:
-                register_ptr = 0
-                for sensor in group.sensors:
-                    try:
-                        registers = result.registers[
-                            register_ptr : register_ptr + sensor.size
-                        ]
-                        register_ptr += sensor.size
-                        available, value = sensor.decode(registers)
-                        if available:
-                            data[sensor.name] = value
-                    except ValueError as error:
-                        # if decoding fails refetch single register and try again
-                        LOGGER.debug(
-                            "decode failed for %s, retrying with single fetch",
-                            sensor.name,
-                            exc_info=error,
-                        )
-
-                        single_result = await self._fetch_retry(
-                            IdmHeatpump._SensorGroup(
-                                start=sensor.address,
-                                count=sensor.size,
-                                sensors=[sensor],
-                            )
-                        )
-
-                        decode_single(sensor, single_result)
+        if failed:
+            self.metrics.group(group.start, group.count).refetches += len(failed)
+
+        try:
+            for sensor in failed:
+                # if decoding fails refetch single register and try again
+                single_result = await self._fetch_retry(SensorGroup.single(sensor))
 
+                if decode_single(sensor, single_result):
+                    self._record_group_failure(sensor)
         except ModbusException as exception:
             LOGGER.warning(
                 "Failed to fetch registers for group %d (count=%d): %s",
@@ -241,6 +545,12 @@ class IdmHeatpump:
 
         LOGGER.debug("decoded registers %d", group.start)
 
+        if failed:
+            # refetched values don't belong to the registers of the group
+            self._frames.pop(group.key, None)
+        elif not unchanged:
+            self._frames[group.key] = (result.registers, dict(data))
+
         if NAME_POWER_USAGE in data and self.max_power_usage is not None:
             reported_power_usage = data[NAME_POWER_USAGE]
 
@@ -253,13 +563,7 @@ class IdmHeatpump:
 
                 sensor = SENSOR_ADDRESSES[NAME_POWER_USAGE]
                 try:
-                    single_result = await self._fetch_retry(
-                        IdmHeatpump._SensorGroup(
-                            start=sensor.address,
-                            count=sensor.size,
-                            sensors=[sensor],
-                        )
-                    )
+                    single_result = await self._fetch_retry(SensorGroup.single(sensor))
 
                     decode_single(sensor, single_result)
                 except ModbusException as exception:
@@ -281,20 +585,153 @@ class IdmHeatpump:
 
         return data
 
-    async def async_get_data(self) -> tuple[bool, dict[str, any]]:
-        """Get data from the heatpump."""
+    async def _fetch_split(
+        self,
+        group: SensorGroup,
+        reason: ReadInputRegistersResponse | ModbusException,
+        retry: bool,
+    ) -> dict[str, any]:
+        if retry:
+            # a single error may be transient, don't blame the gaps or the size yet
+            LOGGER.debug(
+                "Reading group %d (count=%d) failed (%s), trying again",
+                group.start,
+                group.count,
+                reason,
+            )
+            return await self._fetch_sensors(group, retry_split=False)
+
+        if group.count > self.max_group_size:
+            # inconclusive, the probe is tried again in the next cycle
+            self._group_size_probe = None
+
+        addresses = {s.address for s in group.sensors}
+        failures = self._split_failures.get(group.key, 0) + 1
+        if failures < SPLIT_THRESHOLD:
+            LOGGER.info(
+                "Reading group %d (count=%d) failed twice (%s), reading it in parts for now",
+                group.start,
+                group.count,
+                reason,
+            )
+            self._split_failures[group.key] = failures
+            return await self._fetch_parts(
+                group, self.max_group_size, self._no_bridge | addresses
+            )
+
+        self._split_failures.pop(group.key, None)
+
+        # blame the gaps first and only lower the ceiling if a part without
+        # gaps fails on its own
+        gap = await self._find_failed_gap(group.sensors) if group.has_gaps else None
+        if gap is not None:
+            LOGGER.info(
+                "Reading across the unused registers after %d failed (%s), never reading them again",
+                gap,
+                reason,
+            )
+            # some controllers reject unmapped registers
+            self._no_bridge.add(gap)
+        elif group.count > self.max_group_size:
+            LOGGER.info(
+                "Reading group %d (count=%d) failed (%s), limiting reads to %d registers",
+                group.start,
+                group.count,
+                reason,
+                self.max_group_size,
+            )
+            self._group_size_ceiling = min(self._group_size_ceiling, group.count - 1)
+            self._group_size_probe_useless.clear()
+        else:
+            # neither the gaps nor the size of the group are to blame
+            return await self._fetch_parts(
+                group, self.max_group_size, self._no_bridge | addresses
+            )
+
+        self.learned_state_changed = True
+        self._plan_groups()
+
+        return await self._fetch_parts(
+            group, self.max_group_size, self._no_bridge | addresses
+        )
+
+    async def _find_failed_gap(self, sensors: list[BaseSensorAddress]) -> int | None:
+        """Find the gap that makes reading `sensors` fail by bisection.
+
+        Returns the address of the sensor before the gap, or None if a part
+        without gaps fails as well.
+        """
+        while True:
+            gaps = [
+                i
+                for i in range(1, len(sensors))
+                if sensors[i - 1].address + sensors[i - 1].size < sensors[i].address
+            ]
+            if not gaps:
+                return None
+
+            middle = gaps[len(gaps) // 2]
+            for part in (sensors[:middle], sensors[middle:]):
+                if not await self._can_read(part):
+                    sensors = part
+                    break
+            else:
+                return sensors[middle - 1].address
+
+    async def _can_read(self, sensors: list[BaseSensorAddress]) -> bool:
+        group = SensorGroup(
+            start=sensors[0].address,
+            count=sensors[-1].address + sensors[-1].size - sensors[0].address,
+            sensors=sensors,
+        )
+        try:
+            result = await self._fetch_retry(group)
+        except ModbusException:
+            return False
+        return not result.isError()
+
+    async def _fetch_parts(
+        self, group: SensorGroup, max_count: int, no_bridge: set[int]
+    ) -> dict[str, any]:
+        data: dict[str, any] = {}
+        for subgroup in plan_groups(
+            group.sensors,
+            cost_model=self.cost_model,
+            max_count=max_count,
+            no_bridge=no_bridge,
+            isolated=self._isolated,
+        ):
+            data.update(await self._fetch_sensors(subgroup))
+        return data
+
+    async def async_get_data(
+        self,
+        tiers: frozenset[PollTier] = ALL_POLL_TIERS,
+    ) -> tuple[bool, dict[str, any]]:
+        """Get data for all sensors of the given tiers from the heatpump."""
 
         if not self.client.connected:
-            await self.client.connect()
+            await self._connect()
             LOGGER.debug("connected")
 
+        cycle_start = time.perf_counter()
+        if self.frame_recorder is not None:
+            self.frame_recorder.start_cycle()
+        self._start_group_size_probe(tiers)
+        sensor_groups = self.plan_for(tiers)
+
         groups = await asyncio.gather(
-            *[self._fetch_sensors(group) for group in self.sensor_groups],
+            *[self._fetch_sensors(group) for group in sensor_groups],
             return_exceptions=True,
         )
 
         LOGGER.debug("got groups")
 
+        self._finish_group_size_probe(
+            sensor_groups,
+            success=all(isinstance(group, dict) for group in groups),
+        )
+
         data: dict[str, any] = {}
         has_error = False
         for group in groups:
@@ -303,50 +740,108 @@ class IdmHeatpump:
             else:
                 has_error = True
 
-        if len(data) == 0:
-            raise next(e for e in groups if isinstance(e, Exception)) or Exception(
-                "update failed"
-            )
+        self.metrics.record_cycle(
+            [tier.name for tier in sorted(tiers)],
+            len(sensor_groups),
+            time.perf_counter() - cycle_start,
+            has_error,
+        )
+
+        if len(data) == 0 and len(sensor_groups) > 0:
+            raise next(
+                (e for e in groups if isinstance(e, Exception)), None
+            ) or Exception("update failed")
 
         LOGGER.debug("got data")
 
         return has_error, data
 
+    async def async_read_back(
+        self, addresses: list[BaseSensorAddress]
+    ) -> dict[str, any]:
+        """Read only the groups containing the given addresses.
+
+        Returns the values of the given addresses that could be read.
+        """
+        names = {address.name for address in addresses}
+        groups = [
+            group
+            for group in self.sensor_groups
+            if any(sensor.name in names for sensor in group.sensors)
+        ]
+        grouped = {sensor.name for group in groups for sensor in group.sensors}
+        groups += [
+            SensorGroup.single(address)
+            for address in addresses
+            if address.name not in grouped
+        ]
+
+        if not self.client.connected:
+            await self._connect()
+
+        results = await asyncio.gather(
+            *[self._fetch_sensors(group) for group in groups],
+            return_exceptions=True,
+        )
+
+        data: dict[str, any] = {}
+        for result in results:
+            if isinstance(result, dict):
+                data.update(
+                    (name, value) for name, value in result.items() if name in names
+                )
+        return data
+
     async def async_write_value(self, address: BaseSensorAddress[_T], value: _T):
         """Write value to one of the addresses of this heat pump."""
+        [error] = await self.async_write_values([(address, value)])
+        if error is not None:
+            raise error
+
+    async def async_write_values(
+        self, values: list[tuple[BaseSensorAddress, any]]
+    ) -> list[Exception | None]:
+        """Write values to addresses of this heat pump.
+
+        Values of contiguous registers are written in a single transaction.
+        Returns `None` for every value that was written and the error for
+        every other value, in the order of `values`.
+        """
+        results: list[Exception | None] = [None] * len(values)
+
+        writes: list[tuple[int, int, list[int]]] = []
+        for index, (address, value) in enumerate(values):
+            try:
+                registers = address.encode(value)
+                assert len(registers) == address.size
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.debug("encoding %s for %s failed", value, address.name)
+                results[index] = error
+                continue
+            writes.append((index, address.address, registers))
+
+        if len(writes) == 0:
+            return results
+
         if not self.client.connected:
-            await self.client.connect()
+            await self._connect()
             LOGGER.debug("connected")
 
-        registers = address.encode(value)
-        assert len(registers) == address.size
+        for start, registers, indices in _merge_writes(writes):
+            try:
+                async with self._window:
+                    response = await write_registers(
+                        self.client,
+                        address=start,
+                        values=registers,
+                    )
+                if response.isError():
+                    raise ModbusException(
+                        f"writing {len(registers)} registers at {start} failed: {response}"
+                    )
+            except ModbusException as error:
+                LOGGER.debug("write at %d failed: %s", start, error)
+                for index in indices:
+                    results[index] = error
 
-        if "device_id" in signature(self.client.write_registers).parameters:
-            response = await self.client.write_registers(
-                address=address.address,
-                values=registers,
-                device_id=1,
-            )
-        else:
-            response = await self.client.write_registers(  # pylint: disable=unexpected-keyword-arg
-                address=address.address,
-                values=registers,
-                slave=1,
-            )
-        assert not response.isError()
-
-    @staticmethod
-    async def test_hostname(hostname: str) -> bool:
-        """Check if the hostname is reachable via Modbus."""
-        heatpump = IdmHeatpump(
-            hostname,
-            circuits=[],
-            zones=[],
-            no_groups=True,
-            max_power_usage=None,
-        )
-        try:
-            data = await heatpump.async_get_data()
-            return len(data) > 0
-        except Exception:  # pylint: disable=broad-except
-            return False
+        return results
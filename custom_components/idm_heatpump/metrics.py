@@ -0,0 +1,158 @@
+"""Metrics of the requests sent to the heat pump."""
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Collection
+from dataclasses import dataclass, field
+
+# upper bounds (in seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# number of recent requests per group and recent cycles kept for diagnostics
+RECENT_COUNT = 10
+
+
+@dataclass
+class GroupMetrics:
+    """Metrics of reading one range of registers."""
+
+    start: int
+    count: int
+    successes: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    refetches: int = 0
+    decode_failures: int = 0
+    latency_total: float = 0.0
+    # number of successful requests per bucket, the last bucket has no upper bound
+    latency_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    # (outcome, seconds) of the most recent requests
+    recent: deque[tuple[str, float]] = field(
+        default_factory=lambda: deque(maxlen=RECENT_COUNT)
+    )
+    last_registers: list[int] | None = None
+
+    def record_success(self, seconds: float, registers: list[int]):
+        """Record a successful request."""
+        self.successes += 1
+        self.latency_total += seconds
+        self.latency_histogram[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.recent.append(("ok", seconds))
+        self.last_registers = registers
+
+    def record_error(self, seconds: float):
+        """Record a request that returned an error."""
+        self.errors += 1
+        self.recent.append(("error", seconds))
+
+    def record_timeout(self, seconds: float):
+        """Record a request that timed out."""
+        self.timeouts += 1
+        self.recent.append(("timeout", seconds))
+
+    @property
+    def requests(self) -> int:
+        """Get the number of requests sent for this range."""
+        return self.successes + self.errors + self.timeouts
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Get the mean latency of successful requests in seconds."""
+        if self.successes == 0:
+            return None
+        return self.latency_total / self.successes
+
+
+@dataclass
+class HeatpumpMetrics:
+    """Metrics of all requests sent to the heat pump."""
+
+    groups: dict[tuple[int, int], GroupMetrics] = field(default_factory=dict)
+    # counters of the ranges dropped by `prune`, so that totals never decrease
+    pruned: GroupMetrics = field(default_factory=lambda: GroupMetrics(0, 0))
+    cycles: deque[dict[str, any]] = field(
+        default_factory=lambda: deque(maxlen=RECENT_COUNT)
+    )
+
+    def group(self, start: int, count: int) -> GroupMetrics:
+        """Get the metrics for reading `count` registers starting at `start`."""
+        metrics = self.groups.get((start, count))
+        if metrics is None:
+            metrics = self.groups[(start, count)] = GroupMetrics(start, count)
+        return metrics
+
+    def prune(self, keep: Collection[tuple[int, int]]):
+        """Drop the metrics of all ranges except the `(start, count)` in `keep`."""
+        for key in [key for key in self.groups if key not in keep]:
+            group = self.groups.pop(key)
+            self.pruned.successes += group.successes
+            self.pruned.errors += group.errors
+            self.pruned.timeouts += group.timeouts
+            self.pruned.refetches += group.refetches
+            self.pruned.decode_failures += group.decode_failures
+            self.pruned.latency_total += group.latency_total
+
+    def total(self, name: str) -> int:
+        """Get the sum of the counter `name` over all groups."""
+        return getattr(self.pruned, name) + sum(
+            getattr(group, name) for group in self.groups.values()
+        )
+
+    def slowest_group(self) -> GroupMetrics | None:
+        """Get the group with the highest mean latency."""
+        return max(
+            (group for group in self.groups.values() if group.successes > 0),
+            key=lambda group: group.mean_latency,
+            default=None,
+        )
+
+    def record_cycle(
+        self, tiers: list[str], groups: int, seconds: float, has_error: bool
+    ):
+        """Record a poll cycle."""
+        self.cycles.append(
+            {
+                "tiers": tiers,
+                "groups": groups,
+                "seconds": seconds,
+                "has_error": has_error,
+            }
+        )
+
+    def as_dict(self) -> dict[str, any]:
+        """Get all metrics for diagnostics."""
+        return {
+            "latency_buckets": LATENCY_BUCKETS,
+            "cycles": list(self.cycles),
+            "groups": [
+                {
+                    "start": group.start,
+                    "count": group.count,
+                    "successes": group.successes,
+                    "errors": group.errors,
+                    "timeouts": group.timeouts,
+                    "refetches": group.refetches,
+                    "decode_failures": group.decode_failures,
+                    "mean_latency": group.mean_latency,
+                    "latency_histogram": group.latency_histogram,
+                    "recent": [list(request) for request in group.recent],
+                    "last_registers": (
+                        " ".join(f"{r:04x}" for r in group.last_registers)
+                        if group.last_registers is not None
+                        else None
+                    ),
+                }
+                for group in sorted(
+                    self.groups.values(), key=lambda g: (g.start, g.count)
+                )
+            ],
+            "pruned": {
+                "requests": self.pruned.requests,
+                "errors": self.pruned.errors,
+                "timeouts": self.pruned.timeouts,
+                "refetches": self.pruned.refetches,
+                "decode_failures": self.pruned.decode_failures,
+            },
+        }
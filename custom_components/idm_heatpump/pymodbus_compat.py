@@ -0,0 +1,97 @@
+"""Compatibility with the supported pymodbus versions.
+
+The installed API is detected once at import, so the functions defined here
+never need to inspect pymodbus again.
+"""
+
+from collections.abc import Awaitable
+from inspect import signature
+
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.client.mixin import ModbusClientMixin
+
+try:
+    from pymodbus.pdu.register_message import ReadInputRegistersResponse
+except ImportError:
+    from pymodbus.pdu.register_read_message import (  # pyright: ignore[reportMissingImports]
+        ReadInputRegistersResponse,
+    )
+
+__all__ = [
+    "DEVICE_ID",
+    "ReadInputRegistersResponse",
+    "convert_to_registers",
+    "read_input_registers",
+    "write_registers",
+]
+
+DEVICE_ID = 1
+
+# newer pymodbus versions renamed `slave` to `device_id`
+HAS_DEVICE_ID = (
+    "device_id" in signature(ModbusClientMixin.read_input_registers).parameters
+)
+
+# older pymodbus versions only support big endian word order
+HAS_WORD_ORDER = (
+    "word_order" in signature(ModbusClientMixin.convert_to_registers).parameters
+)
+
+if HAS_DEVICE_ID:
+
+    def read_input_registers(
+        client: AsyncModbusTcpClient, address: int, count: int
+    ) -> Awaitable[ReadInputRegistersResponse]:
+        """Read `count` input registers starting at `address`."""
+        return client.read_input_registers(
+            address=address, count=count, device_id=DEVICE_ID
+        )
+
+    def write_registers(
+        client: AsyncModbusTcpClient, address: int, values: list[int]
+    ) -> Awaitable:
+        """Write `values` to the registers starting at `address`."""
+        return client.write_registers(
+            address=address, values=values, device_id=DEVICE_ID
+        )
+
+else:
+
+    def read_input_registers(
+        client: AsyncModbusTcpClient, address: int, count: int
+    ) -> Awaitable[ReadInputRegistersResponse]:
+        """Read `count` input registers starting at `address`."""
+        return client.read_input_registers(  # pylint: disable=unexpected-keyword-arg
+            address=address, count=count, slave=DEVICE_ID
+        )
+
+    def write_registers(
+        client: AsyncModbusTcpClient, address: int, values: list[int]
+    ) -> Awaitable:
+        """Write `values` to the registers starting at `address`."""
+        return client.write_registers(  # pylint: disable=unexpected-keyword-arg
+            address=address, values=values, slave=DEVICE_ID
+        )
+
+
+if HAS_WORD_ORDER:
+
+    def convert_to_registers(
+        value: int | float, data_type: ModbusClientMixin.DATATYPE
+    ) -> list[int]:
+        """Convert `value` to registers with the low word first."""
+        return ModbusClientMixin.convert_to_registers(
+            value=value, data_type=data_type, word_order="little"
+        )
+
+else:
+
+    def convert_to_registers(
+        value: int | float, data_type: ModbusClientMixin.DATATYPE
+    ) -> list[int]:
+        """Convert `value` to registers with the low word first."""
+        return list(
+            reversed(
+                ModbusClientMixin.convert_to_registers(value=value, data_type=data_type)
+            )
+        )
@@ -1,15 +1,26 @@
 """Sensor platform for idm_heatpump."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any, TypeVar
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, HomeAssistantError
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from pymodbus.client.mixin import ModbusClientMixin
+from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import slugify
 
 from .const import (
+    CONF_DISPLAY_NAME,
+    CONF_HOSTNAME,
     DOMAIN,
     SERVICE_SET_BATTERY,
     SERVICE_SET_CIRCUIT_MODE,
@@ -18,34 +29,113 @@ from .const import (
     SERVICE_SET_ROOM_MODE,
     SERVICE_SET_SYSTEM_STATUS,
     SERVICE_SET_TEMPERATURE,
-    CircuitMode,
-    RoomMode,
     SensorFeatures,
-    SystemStatus,
 )
 from .coordinator import IdmHeatpumpDataUpdateCoordinator
 from .entity import IdmHeatpumpEntity
+from .entity_tables import main_device_info
+from .metrics import GroupMetrics
 from .sensor_addresses import IdmSensorAddress
 from .services import register_set_service
 
 _T = TypeVar("_T")
 
 
-def _convert_temperature(value: Any | None, entity: IdmHeatpumpEntity) -> float | int:
-    value = float(value)
-    if entity.sensor_address.datatype != ModbusClientMixin.DATATYPE.FLOAT32:
-        if int(value) != value:
-            raise HomeAssistantError(
-                f"Must be integer value to use {SERVICE_SET_TEMPERATURE} on {entity.entity_id}",
-                translation_domain=DOMAIN,
-                translation_key="integer_required",
-                translation_placeholders={
-                    "entity_id": entity.entity_id,
-                },
-            )
+@dataclass(frozen=True, kw_only=True)
+class IdmHeatpumpMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor for the connection to the heat pump."""
+
+    value_fn: Callable[[IdmHeatpumpDataUpdateCoordinator], StateType]
+    attributes_fn: Callable[[IdmHeatpumpDataUpdateCoordinator], dict[str, Any]] = (
+        lambda _: {}
+    )
+
 
-        value = int(value)
-    return value
+def _slowest_group_attributes(
+    coordinator: IdmHeatpumpDataUpdateCoordinator,
+) -> dict[str, Any]:
+    group: GroupMetrics | None = coordinator.heatpump.metrics.slowest_group()
+    if group is None:
+        return {}
+    return {
+        "start": group.start,
+        "count": group.count,
+        "requests": group.requests,
+        "errors": group.errors,
+        "timeouts": group.timeouts,
+    }
+
+
+METRIC_SENSORS = [
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="requests",
+        name="Modbus requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.heatpump.metrics.total("requests"),
+    ),
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="request_errors",
+        name="Modbus request errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.heatpump.metrics.total("errors"),
+    ),
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="request_timeouts",
+        name="Modbus request timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.heatpump.metrics.total("timeouts"),
+    ),
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="reconnects",
+        name="Modbus reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.heatpump.connection.reconnects,
+    ),
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="refetches",
+        name="Single register refetches",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.heatpump.metrics.total("refetches"),
+    ),
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="decode_failures",
+        name="Decode failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.heatpump.metrics.total("decode_failures"),
+    ),
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="slowest_group_latency",
+        name="Slowest register group latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda c: (
+            group.mean_latency * 1000
+            if (group := c.heatpump.metrics.slowest_group()) is not None
+            else None
+        ),
+        attributes_fn=_slowest_group_attributes,
+    ),
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="suppressed_updates",
+        name="Suppressed entity updates",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.suppressed_updates,
+    ),
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="coalesced_writes",
+        name="Coalesced writes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.write_scheduler.coalesced,
+    ),
+    IdmHeatpumpMetricSensorEntityDescription(
+        key="skipped_writes",
+        name="Skipped writes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.write_scheduler.skipped,
+    ),
+]
 
 
 async def async_setup_entry(
@@ -63,55 +153,54 @@ async def async_setup_entry(
             if isinstance(address, IdmSensorAddress)
         ],
     )
+    async_add_entities(
+        [
+            IdmHeatpumpMetricSensor(coordinator, entry, description)
+            for description in METRIC_SENSORS
+        ],
+    )
 
     register_set_service(
         Platform.SENSOR,
         hass,
         SERVICE_SET_POWER,
         SensorFeatures.SET_POWER,
-        lambda v, _: float(v),
     )
     register_set_service(
         Platform.SENSOR,
         hass,
         SERVICE_SET_BATTERY,
         SensorFeatures.SET_BATTERY,
-        lambda v, _: int(v),
     )
     register_set_service(
         Platform.SENSOR,
         hass,
         SERVICE_SET_TEMPERATURE,
         SensorFeatures.SET_TEMPERATURE,
-        _convert_temperature,
     )
     register_set_service(
         Platform.SENSOR,
         hass,
         SERVICE_SET_HUMIDITY,
         SensorFeatures.SET_HUMIDITY,
-        lambda v, _: float(v),
     )
     register_set_service(
         Platform.SENSOR,
         hass,
         SERVICE_SET_ROOM_MODE,
         SensorFeatures.SET_ROOM_MODE,
-        lambda v, _: RoomMode[v],
     )
     register_set_service(
         Platform.SENSOR,
         hass,
         SERVICE_SET_CIRCUIT_MODE,
         SensorFeatures.SET_CIRCUIT_MODE,
-        lambda v, _: CircuitMode[v],
     )
     register_set_service(
         Platform.SENSOR,
         hass,
         SERVICE_SET_SYSTEM_STATUS,
         SensorFeatures.SET_SYSTEM_STATUS,
-        lambda v, _: SystemStatus[v],
     )
 
 
@@ -125,8 +214,7 @@ class IdmHeatpumpSensor(IdmHeatpumpEntity, SensorEntity):
         sensor_address: IdmSensorAddress,
     ):
         """Create sensor."""
-        super().__init__(coordinator, config_entry)
-        self.sensor_address = sensor_address
+        super().__init__(coordinator, config_entry, sensor_address)
         self.entity_description = self.sensor_address.entity_description(config_entry)
 
     @property
@@ -138,3 +226,45 @@ class IdmHeatpumpSensor(IdmHeatpumpEntity, SensorEntity):
     def native_value(self):
         """Return the state of the sensor."""
         return self.coordinator.data.get(self.sensor_address.name)
+
+
+class IdmHeatpumpMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor for the connection to the heat pump."""
+
+    coordinator: IdmHeatpumpDataUpdateCoordinator
+    entity_description: IdmHeatpumpMetricSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: IdmHeatpumpDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        description: IdmHeatpumpMetricSensorEntityDescription,
+    ):
+        """Create metric sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = (
+            f"{config_entry.data.get(CONF_DISPLAY_NAME)}: {description.name}"
+        )
+        self._attr_unique_id = (
+            f"{slugify(config_entry.data.get(CONF_HOSTNAME))}_metric_{description.key}"
+        )
+        self._attr_device_info = main_device_info(config_entry)
+
+    @property
+    def available(self) -> bool:
+        """Return wether this sensor is available."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return extra attributes."""
+        return self.entity_description.attributes_fn(self.coordinator)
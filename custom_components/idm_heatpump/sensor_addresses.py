@@ -1,10 +1,11 @@
 """Sensor addresses."""
 
+import struct
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum, IntEnum, IntFlag
-from inspect import signature
-from typing import Generic, TypeVar
+from functools import cache
+from typing import Any, Generic, TypeVar
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -32,6 +33,7 @@ from .const import (
     CircuitMode,
     HeatPumpStatus,
     IscMode,
+    PollTier,
     RoomMode,
     SensorFeatures,
     SmartGridStatus,
@@ -45,13 +47,14 @@ from .const import (
     ZoneMode,
 )
 from .logger import LOGGER
+from .pymodbus_compat import convert_to_registers
 
 _T = TypeVar("_T")
 _EnumT = TypeVar("_EnumT", bound=IntEnum)
 _FlagT = TypeVar("_FlagT", bound=IntFlag)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class BaseSensorAddress(ABC, Generic[_T]):
     """Base class for (binary) sensors of an IDM heatpump."""
 
@@ -59,6 +62,7 @@ class BaseSensorAddress(ABC, Generic[_T]):
     name: str
     supported_features: SensorFeatures = SensorFeatures.NONE
     force_single: bool = False
+    poll_tier: PollTier = PollTier.NORMAL
 
     @property
     def size(self) -> int:
@@ -70,51 +74,51 @@ class BaseSensorAddress(ABC, Generic[_T]):
     def datatype(self) -> ModbusClientMixin.DATATYPE:
         """Get the pymodbus datatype for this sensor."""
 
+    @property
+    def struct_format(self) -> str:
+        """Get the struct format character for this sensor's value.
+
+        The value must be unpacked from its registers packed as little endian
+        words, which takes care of the word order used by IDM heat pumps.
+        """
+        return self.datatype.value[0]
+
     def _decode_raw(self, registers: list[int]):
         assert len(registers) == self.size
-        if (
-            "word_order"
-            in signature(ModbusClientMixin.convert_from_registers).parameters
-        ):
-            return ModbusClientMixin.convert_from_registers(
-                registers=registers,
-                data_type=self.datatype,
-                word_order="little",
-            )
-        else:
-            return ModbusClientMixin.convert_from_registers(
-                registers=list(reversed(registers)),
-                data_type=self.datatype,
-            )
+        return struct.unpack(
+            f"<{self.struct_format}", struct.pack(f"<{self.size}H", *registers)
+        )[0]
 
     def _encode_raw(self, value: int | float) -> list[int]:
-        if "word_order" in signature(ModbusClientMixin.convert_to_registers).parameters:
-            return ModbusClientMixin.convert_to_registers(
-                value=value,
-                data_type=self.datatype,
-                word_order="little",
-            )
-        else:
-            return list(
-                reversed(
-                    ModbusClientMixin.convert_to_registers(
-                        value=value,
-                        data_type=self.datatype,
-                    )
-                )
-            )
+        return convert_to_registers(value, self.datatype)
 
-    @abstractmethod
     def decode(self, registers: list[int]) -> tuple[bool, _T]:
         """Decode this sensor's value."""
+        return self.decode_value(self._decode_raw(registers))
+
+    @abstractmethod
+    def decode_value(self, raw_value: int | float) -> tuple[bool, _T]:
+        """Check and convert the raw value unpacked from this sensor's registers."""
 
     @abstractmethod
     def encode(self, value: _T) -> list[int]:
         """Encode this sensor's value."""
 
-    @abstractmethod
+    def restore_value(self, value: Any) -> _T:
+        """Convert a value loaded from storage back to this sensor's type."""
+        return value
+
     def entity_description(self, config_entry: ConfigEntry) -> SensorEntityDescription:
-        """Get SensorEntityDescription for this sensor."""
+        """Get SensorEntityDescription for this sensor.
+
+        Descriptions are interned, entities of config entries with the same
+        display name share them.
+        """
+        return _interned_description(self, config_entry.data.get(CONF_DISPLAY_NAME))
+
+    @abstractmethod
+    def _entity_description(self, display_name: str) -> SensorEntityDescription:
+        """Create SensorEntityDescription for this sensor."""
 
     @property
     def zone_id(self) -> int | None:
@@ -130,7 +134,7 @@ class BaseSensorAddress(ABC, Generic[_T]):
         return len(ZONE_OFFSETS)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class IdmSensorAddress(BaseSensorAddress[_T]):
     """Describes one of the sensors of an IDM heatpump."""
 
@@ -138,7 +142,7 @@ class IdmSensorAddress(BaseSensorAddress[_T]):
     state_class: SensorStateClass | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class IdmBinarySensorAddress(BaseSensorAddress[bool]):
     """Describes one of the binary sensors of an IDM heatpump."""
 
@@ -149,9 +153,9 @@ class IdmBinarySensorAddress(BaseSensorAddress[bool]):
         """Get the pymodbus datatype for this sensor."""
         return ModbusClientMixin.DATATYPE.UINT16
 
-    def decode(self, registers: list[int]) -> tuple[bool, bool]:
-        """Decode this sensor's value."""
-        value = self._decode_raw(registers)
+    def decode_value(self, raw_value: int) -> tuple[bool, bool]:
+        """Check and convert the raw value unpacked from this sensor's registers."""
+        value = raw_value
         LOGGER.debug("raw value (uint16) for %s: %d", self.name, value)
         return (True, value > 0)
 
@@ -159,18 +163,16 @@ class IdmBinarySensorAddress(BaseSensorAddress[bool]):
         """Encode this sensor's value."""
         return self._encode_raw(1 if value else 0)
 
-    def entity_description(
-        self, config_entry: ConfigEntry
-    ) -> BinarySensorEntityDescription:
+    def _entity_description(self, display_name: str) -> BinarySensorEntityDescription:
         """SensorEntityDescription for this sensor."""
         return BinarySensorEntityDescription(
             key=self.name,
-            name=f"{config_entry.data.get(CONF_DISPLAY_NAME)}: {SENSOR_NAMES.get(self.address)}",
+            name=f"{display_name}: {SENSOR_NAMES.get(self.address)}",
             device_class=self.device_class,
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class _FloatSensorAddress(IdmSensorAddress[float]):
     unit: str | None
     decimal_digits: int = 2
@@ -183,8 +185,7 @@ class _FloatSensorAddress(IdmSensorAddress[float]):
         """Get the pymodbus datatype for this sensor."""
         return ModbusClientMixin.DATATYPE.FLOAT32
 
-    def decode(self, registers: list[int]) -> tuple[bool, float]:
-        raw_value = self._decode_raw(registers)
+    def decode_value(self, raw_value: float) -> tuple[bool, float]:
         LOGGER.debug("raw value (float32) for %s: %d", self.name, raw_value)
         value = round(raw_value * self.scale, self.decimal_digits)
         LOGGER.debug("scaled & rounded value for %s: %d", self.name, value)
@@ -208,17 +209,17 @@ class _FloatSensorAddress(IdmSensorAddress[float]):
         )
         return self._encode_raw(value)
 
-    def entity_description(self, config_entry: ConfigEntry) -> SensorEntityDescription:
+    def _entity_description(self, display_name: str) -> SensorEntityDescription:
         return SensorEntityDescription(
             key=self.name,
-            name=f"{config_entry.data.get(CONF_DISPLAY_NAME)}: {SENSOR_NAMES.get(self.address)}",
+            name=f"{display_name}: {SENSOR_NAMES.get(self.address)}",
             device_class=self.device_class,
             state_class=self.state_class,
             native_unit_of_measurement=self.unit,
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class _UCharSensorAddress(IdmSensorAddress[int]):
     unit: str | None
     min_value: int | None = None
@@ -229,8 +230,8 @@ class _UCharSensorAddress(IdmSensorAddress[int]):
         """Get the pymodbus datatype for this sensor."""
         return ModbusClientMixin.DATATYPE.UINT16
 
-    def decode(self, registers: list[int]) -> tuple[bool, int]:
-        value = self._decode_raw(registers)
+    def decode_value(self, raw_value: int) -> tuple[bool, int]:
+        value = raw_value
         LOGGER.debug("raw value (uint16) for %s: %d", self.name, value)
 
         if self.max_value == 0xFFFE and value == 0xFFFF:
@@ -252,17 +253,17 @@ class _UCharSensorAddress(IdmSensorAddress[int]):
         )
         return self._encode_raw(value)
 
-    def entity_description(self, config_entry: ConfigEntry) -> SensorEntityDescription:
+    def _entity_description(self, display_name: str) -> SensorEntityDescription:
         return SensorEntityDescription(
             key=self.name,
-            name=f"{config_entry.data.get(CONF_DISPLAY_NAME)}: {SENSOR_NAMES.get(self.address)}",
+            name=f"{display_name}: {SENSOR_NAMES.get(self.address)}",
             device_class=self.device_class,
             state_class=self.state_class,
             native_unit_of_measurement=self.unit,
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class _WordSensorAddress(IdmSensorAddress[int]):
     unit: str | None
     min_value: int | None = None
@@ -273,8 +274,8 @@ class _WordSensorAddress(IdmSensorAddress[int]):
         """Get the pymodbus datatype for this sensor."""
         return ModbusClientMixin.DATATYPE.INT16
 
-    def decode(self, registers: list[int]) -> tuple[bool, int]:
-        value = self._decode_raw(registers)
+    def decode_value(self, raw_value: int) -> tuple[bool, int]:
+        value = raw_value
 
         if self.min_value == 0 and value == -1:
             # special case: unavailable
@@ -296,17 +297,17 @@ class _WordSensorAddress(IdmSensorAddress[int]):
         )
         return self._encode_raw(value)
 
-    def entity_description(self, config_entry: ConfigEntry) -> SensorEntityDescription:
+    def _entity_description(self, display_name: str) -> SensorEntityDescription:
         return SensorEntityDescription(
             key=self.name,
-            name=f"{config_entry.data.get(CONF_DISPLAY_NAME)}: {SENSOR_NAMES.get(self.address)}",
+            name=f"{display_name}: {SENSOR_NAMES.get(self.address)}",
             device_class=self.device_class,
             state_class=self.state_class,
             native_unit_of_measurement=self.unit,
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class _EnumSensorAddress(IdmSensorAddress[_EnumT], Generic[_EnumT]):
     enum: type[_EnumT]
 
@@ -315,8 +316,8 @@ class _EnumSensorAddress(IdmSensorAddress[_EnumT], Generic[_EnumT]):
         """Get the pymodbus datatype for this sensor."""
         return ModbusClientMixin.DATATYPE.UINT16
 
-    def decode(self, registers: list[int]) -> tuple[bool, _EnumT]:
-        value = self._decode_raw(registers)
+    def decode_value(self, raw_value: int) -> tuple[bool, _EnumT]:
+        value = raw_value
         LOGGER.debug("raw value (uint16) for %s: %d", self.name, value)
 
         if value == 0xFFFF and 0xFFFF not in list(map(int, self.enum)):
@@ -331,16 +332,19 @@ class _EnumSensorAddress(IdmSensorAddress[_EnumT], Generic[_EnumT]):
     def encode(self, value: _EnumT) -> list[int]:
         return self._encode_raw(value.value)
 
-    def entity_description(self, config_entry: ConfigEntry) -> SensorEntityDescription:
+    def restore_value(self, value: int) -> _EnumT:
+        return self.enum(value)
+
+    def _entity_description(self, display_name: str) -> SensorEntityDescription:
         return SensorEntityDescription(
             key=self.name,
-            name=f"{config_entry.data.get(CONF_DISPLAY_NAME)}: {SENSOR_NAMES.get(self.address)}",
+            name=f"{display_name}: {SENSOR_NAMES.get(self.address)}",
             device_class=self.device_class,
             state_class=self.state_class,
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class _BitFieldSensorAddress(IdmSensorAddress[_FlagT], Generic[_FlagT]):
     flag: type[_FlagT]
 
@@ -349,8 +353,8 @@ class _BitFieldSensorAddress(IdmSensorAddress[_FlagT], Generic[_FlagT]):
         """Get the pymodbus datatype for this sensor."""
         return ModbusClientMixin.DATATYPE.UINT16
 
-    def decode(self, registers: list[int]) -> tuple[bool, _FlagT]:
-        value = self._decode_raw(registers)
+    def decode_value(self, raw_value: int) -> tuple[bool, _FlagT]:
+        value = raw_value
         LOGGER.debug("raw value (uint16) for %s: %d", self.name, value)
         if value == 0xFFFF:
             # special case: unavailable
@@ -364,15 +368,26 @@ class _BitFieldSensorAddress(IdmSensorAddress[_FlagT], Generic[_FlagT]):
     def encode(self, value: _FlagT) -> list[int]:
         return self._encode_raw(value)
 
-    def entity_description(self, config_entry: ConfigEntry) -> SensorEntityDescription:
+    def restore_value(self, value: int) -> _FlagT:
+        return self.flag(value)
+
+    def _entity_description(self, display_name: str) -> SensorEntityDescription:
         return SensorEntityDescription(
             key=self.name,
-            name=f"{config_entry.data.get(CONF_DISPLAY_NAME)}: {SENSOR_NAMES.get(self.address)}",
+            name=f"{display_name}: {SENSOR_NAMES.get(self.address)}",
             device_class=self.device_class,
             state_class=self.state_class,
         )
 
 
+@cache
+def _interned_description(
+    sensor: BaseSensorAddress, display_name: str
+) -> SensorEntityDescription:
+    # pylint: disable-next=protected-access
+    return sensor._entity_description(display_name)
+
+
 class HeatingCircuit(Enum):
     """Heating circuit of the IDM heatpump."""
 
@@ -385,11 +400,12 @@ class HeatingCircuit(Enum):
     G = 6
 
 
-def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
-    """Get data for heat circuit sensors."""
+@cache
+def heating_circuit_sensors(circuit: HeatingCircuit) -> tuple[IdmSensorAddress, ...]:
+    """Get data for heat circuit sensors, built once per circuit."""
     offset = circuit.value
     circuit_name = circuit.name.lower()
-    return [
+    return (
         _FloatSensorAddress(
             address=1350 + offset * 2,
             name=f"temp_flow_current_circuit_{circuit_name}",
@@ -421,6 +437,7 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
         _FloatSensorAddress(
             address=1401 + offset * 2,
             name=f"temp_room_target_heating_normal_circuit_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -431,6 +448,7 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
         _FloatSensorAddress(
             address=1415 + offset * 2,
             name=f"temp_room_target_heating_eco_circuit_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -441,11 +459,13 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
         _FloatSensorAddress(
             address=1429 + offset * 2,
             name=f"curve_circuit_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=None,
         ),
         _UCharSensorAddress(
             address=1442 + offset,
             name=f"temp_threshold_heating_circuit_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -455,6 +475,7 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
         _UCharSensorAddress(
             address=1449 + offset,
             name=f"temp_flow_target_constant_circuit_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -464,6 +485,7 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
         _FloatSensorAddress(
             address=1457 + offset * 2,
             name=f"temp_room_target_cooling_normal_circuit_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -473,6 +495,7 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
         _FloatSensorAddress(
             address=1471 + offset * 2,
             name=f"temp_room_target_cooling_eco_circuit_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -482,6 +505,7 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
         _UCharSensorAddress(
             address=1484 + offset,
             name=f"temp_threshold_cooling_circuit_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -491,6 +515,7 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
         _UCharSensorAddress(
             address=1491 + offset,
             name=f"temp_flow_target_cooling_circuit_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -505,6 +530,7 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
         _UCharSensorAddress(
             address=1505 + offset,
             name=f"curve_offset_{circuit_name}",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             supported_features=SensorFeatures.SET_TEMPERATURE,
         ),
@@ -516,7 +542,7 @@ def heating_circuit_sensors(circuit: HeatingCircuit) -> list[IdmSensorAddress]:
             state_class=SensorStateClass.MEASUREMENT,
             supported_features=SensorFeatures.SET_TEMPERATURE,
         ),
-    ]
+    )
 
 
 T = TypeVar("T")
@@ -546,85 +572,95 @@ class ZoneModule:
         self.room_count = room_count
         self.room_9_relay = room_9_relay
 
-    def sensors(self) -> list[IdmSensorAddress]:
-        """Get data for zone module sensors."""
+    def sensors(self) -> tuple[IdmSensorAddress, ...]:
+        """Get data for zone module sensors, shared by equal zone modules."""
+        return _zone_sensors(self.index, self.room_count)
 
-        return [
-            _EnumSensorAddress(
-                enum=ZoneMode,
-                address=ZONE_OFFSETS[self.index],
-                name=f"zone_{self.index+1}_mode",
-            ),
-            *[
-                s
-                for room in range(self.room_count)
-                for s in [
-                    _FloatSensorAddress(
-                        address=ZONE_OFFSETS[self.index] + ROOM_OFFSETS[room],
-                        name=f"zone_{self.index+1}_room_{room+1}_temp_current",
-                        unit=UnitOfTemperature.CELSIUS,
-                        device_class=SensorDeviceClass.TEMPERATURE,
-                        state_class=SensorStateClass.MEASUREMENT,
-                        supported_features=SensorFeatures.SET_TEMPERATURE,
-                        min_value=-30,
-                        max_value=80,
-                    ),
-                    _FloatSensorAddress(
-                        address=ZONE_OFFSETS[self.index] + ROOM_OFFSETS[room] + 2,
-                        name=f"zone_{self.index+1}_room_{room+1}_temp_target",
-                        unit=UnitOfTemperature.CELSIUS,
-                        device_class=SensorDeviceClass.TEMPERATURE,
-                        state_class=SensorStateClass.MEASUREMENT,
-                        supported_features=SensorFeatures.SET_TEMPERATURE,
-                    ),
-                    _UCharSensorAddress(
-                        address=ZONE_OFFSETS[self.index] + ROOM_OFFSETS[room] + 4,
-                        name=f"zone_{self.index+1}_room_{room+1}_humidity",
-                        unit=PERCENTAGE,
-                        device_class=SensorDeviceClass.HUMIDITY,
-                        state_class=SensorStateClass.MEASUREMENT,
-                        supported_features=SensorFeatures.SET_HUMIDITY,
-                        min_value=0,
-                        max_value=100,
-                    ),
-                    _EnumSensorAddress(
-                        enum=RoomMode,
-                        address=ZONE_OFFSETS[self.index] + ROOM_OFFSETS[room] + 5,
-                        name=f"zone_{self.index+1}_room_{room+1}_mode",
-                        force_single=True,
-                        device_class=SensorDeviceClass.ENUM,
-                        supported_features=SensorFeatures.SET_ROOM_MODE,
-                    ),
-                ]
-            ],
-        ]
+    def binary_sensors(self) -> tuple[IdmBinarySensorAddress, ...]:
+        """Get data for zone module binary sensors, shared by equal zone modules."""
+        return _zone_binary_sensors(self.index, self.room_count, self.room_9_relay)
 
-    def binary_sensors(self) -> list[IdmBinarySensorAddress]:
-        """Get data for zone module binary sensors."""
 
-        sensors = [
+@cache
+def _zone_sensors(index: int, room_count: int) -> tuple[IdmSensorAddress, ...]:
+    return (
+        _EnumSensorAddress(
+            enum=ZoneMode,
+            address=ZONE_OFFSETS[index],
+            name=f"zone_{index+1}_mode",
+        ),
+        *[
+            s
+            for room in range(room_count)
+            for s in [
+                _FloatSensorAddress(
+                    address=ZONE_OFFSETS[index] + ROOM_OFFSETS[room],
+                    name=f"zone_{index+1}_room_{room+1}_temp_current",
+                    unit=UnitOfTemperature.CELSIUS,
+                    device_class=SensorDeviceClass.TEMPERATURE,
+                    state_class=SensorStateClass.MEASUREMENT,
+                    supported_features=SensorFeatures.SET_TEMPERATURE,
+                    min_value=-30,
+                    max_value=80,
+                ),
+                _FloatSensorAddress(
+                    address=ZONE_OFFSETS[index] + ROOM_OFFSETS[room] + 2,
+                    name=f"zone_{index+1}_room_{room+1}_temp_target",
+                    unit=UnitOfTemperature.CELSIUS,
+                    device_class=SensorDeviceClass.TEMPERATURE,
+                    state_class=SensorStateClass.MEASUREMENT,
+                    supported_features=SensorFeatures.SET_TEMPERATURE,
+                ),
+                _UCharSensorAddress(
+                    address=ZONE_OFFSETS[index] + ROOM_OFFSETS[room] + 4,
+                    name=f"zone_{index+1}_room_{room+1}_humidity",
+                    unit=PERCENTAGE,
+                    device_class=SensorDeviceClass.HUMIDITY,
+                    state_class=SensorStateClass.MEASUREMENT,
+                    supported_features=SensorFeatures.SET_HUMIDITY,
+                    min_value=0,
+                    max_value=100,
+                ),
+                _EnumSensorAddress(
+                    enum=RoomMode,
+                    address=ZONE_OFFSETS[index] + ROOM_OFFSETS[room] + 5,
+                    name=f"zone_{index+1}_room_{room+1}_mode",
+                    force_single=True,
+                    device_class=SensorDeviceClass.ENUM,
+                    supported_features=SensorFeatures.SET_ROOM_MODE,
+                ),
+            ]
+        ],
+    )
+
+
+@cache
+def _zone_binary_sensors(
+    index: int, room_count: int, room_9_relay: bool
+) -> tuple[IdmBinarySensorAddress, ...]:
+    sensors = [
+        IdmBinarySensorAddress(
+            address=ZONE_OFFSETS[index] + 1,
+            name=f"zone_{index+1}_dehumidifier",
+        ),
+        *[
             IdmBinarySensorAddress(
-                address=ZONE_OFFSETS[self.index] + 1,
-                name=f"zone_{self.index+1}_dehumidifier",
-            ),
-            *[
-                IdmBinarySensorAddress(
-                    address=ZONE_OFFSETS[self.index] + ROOM_OFFSETS[room] + 6,
-                    name=f"zone_{self.index+1}_room_{room+1}_relay",
-                )
-                for room in range(self.room_count)
-            ],
-        ]
+                address=ZONE_OFFSETS[index] + ROOM_OFFSETS[room] + 6,
+                name=f"zone_{index+1}_room_{room+1}_relay",
+            )
+            for room in range(room_count)
+        ],
+    ]
 
-        if self.room_9_relay:
-            sensors.append(
-                IdmBinarySensorAddress(
-                    address=ZONE_OFFSETS[self.index] + 64,
-                    name=f"zone_{self.index+1}_room_9_relay",
-                )
+    if room_9_relay:
+        sensors.append(
+            IdmBinarySensorAddress(
+                address=ZONE_OFFSETS[index] + 64,
+                name=f"zone_{index+1}_room_9_relay",
             )
+        )
 
-        return sensors
+    return tuple(sensors)
 
 
 SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
@@ -641,6 +677,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _FloatSensorAddress(
             address=76,
             name="power_resistive_heater",
+            poll_tier=PollTier.FAST,
             unit=UnitOfPower.KILO_WATT,
             device_class=SensorDeviceClass.POWER,
             state_class=SensorStateClass.MEASUREMENT,
@@ -698,12 +735,14 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _UCharSensorAddress(
             address=1004,
             name="failure_id",
+            poll_tier=PollTier.FAST,
             unit=None,
         ),
         _EnumSensorAddress(
             enum=SystemStatus,
             address=1005,
             name="status_system",
+            poll_tier=PollTier.FAST,
             device_class=SensorDeviceClass.ENUM,
             supported_features=SensorFeatures.SET_SYSTEM_STATUS,
         ),
@@ -711,6 +750,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
             enum=SmartGridStatus,
             address=1006,
             name="status_smart_grid",
+            poll_tier=PollTier.FAST,
         ),
         _FloatSensorAddress(
             address=1008,
@@ -750,6 +790,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _UCharSensorAddress(
             address=1032,
             name="temp_water_target",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -759,6 +800,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _UCharSensorAddress(
             address=1033,
             name="temp_water_switch_on",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -768,6 +810,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _UCharSensorAddress(
             address=1034,
             name="temp_water_switch_off",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -841,6 +884,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
             flag=HeatPumpStatus,
             address=1090,
             name="status_heat_pump",
+            poll_tier=PollTier.FAST,
         ),
         _WordSensorAddress(
             address=1104,
@@ -925,6 +969,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _WordSensorAddress(
             address=1120,
             name="temp_second_source_bivalence_1",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -934,6 +979,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _WordSensorAddress(
             address=1121,
             name="temp_second_source_bivalence_2",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -943,6 +989,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _WordSensorAddress(
             address=1122,
             name="temp_third_source_bivalence_1",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -952,6 +999,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _WordSensorAddress(
             address=1123,
             name="temp_third_source_bivalence_2",
+            poll_tier=PollTier.SLOW,
             unit=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
@@ -1090,6 +1138,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _FloatSensorAddress(
             address=1790,
             name="power_current",
+            poll_tier=PollTier.FAST,
             unit=UnitOfPower.KILO_WATT,
             device_class=SensorDeviceClass.POWER,
             state_class=SensorStateClass.MEASUREMENT,
@@ -1097,6 +1146,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _FloatSensorAddress(
             address=1792,
             name="power_current_solar",
+            poll_tier=PollTier.FAST,
             unit=UnitOfPower.KILO_WATT,
             device_class=SensorDeviceClass.POWER,
             state_class=SensorStateClass.MEASUREMENT,
@@ -1156,6 +1206,7 @@ SENSOR_ADDRESSES: dict[str, IdmSensorAddress] = {
         _FloatSensorAddress(
             address=4122,
             name=NAME_POWER_USAGE,
+            poll_tier=PollTier.FAST,
             unit=UnitOfPower.KILO_WATT,
             device_class=SensorDeviceClass.POWER,
             state_class=SensorStateClass.MEASUREMENT,
@@ -1171,26 +1222,31 @@ BINARY_SENSOR_ADDRESSES: dict[str, IdmBinarySensorAddress] = {
         IdmBinarySensorAddress(
             address=1099,
             name="failure_heat_pump",
+            poll_tier=PollTier.FAST,
             device_class=BinarySensorDeviceClass.PROBLEM,
         ),
         IdmBinarySensorAddress(
             address=1100,
             name="state_compressor_1",
+            poll_tier=PollTier.FAST,
             device_class=BinarySensorDeviceClass.RUNNING,
         ),
         IdmBinarySensorAddress(
             address=1101,
             name="state_compressor_2",
+            poll_tier=PollTier.FAST,
             device_class=BinarySensorDeviceClass.RUNNING,
         ),
         IdmBinarySensorAddress(
             address=1102,
             name="state_compressor_3",
+            poll_tier=PollTier.FAST,
             device_class=BinarySensorDeviceClass.RUNNING,
         ),
         IdmBinarySensorAddress(
             address=1103,
             name="state_compressor_4",
+            poll_tier=PollTier.FAST,
             device_class=BinarySensorDeviceClass.RUNNING,
         ),
         IdmBinarySensorAddress(
@@ -4,19 +4,72 @@ from collections.abc import Callable
 from functools import partial
 from typing import Any, TypeVar
 
-from homeassistant.core import HomeAssistant, HomeAssistantError, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    HomeAssistantError,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.helpers import entity_platform
+from pymodbus.client.mixin import ModbusClientMixin
 
 from .const import (
     DOMAIN,
+    SERVICE_SET_TEMPERATURE,
+    SERVICE_WRITE_VALUES,
+    CircuitMode,
+    RoomMode,
     SensorFeatures,
+    SystemStatus,
 )
+from .coordinator import IdmHeatpumpDataUpdateCoordinator
 from .entity import IdmHeatpumpEntity
 from .logger import LOGGER
 
 _T = TypeVar("_T")
 
 
+def _convert_temperature(value: Any | None, entity: IdmHeatpumpEntity) -> float | int:
+    value = float(value)
+    if entity.sensor_address.datatype != ModbusClientMixin.DATATYPE.FLOAT32:
+        if int(value) != value:
+            raise HomeAssistantError(
+                f"Must be integer value to use {SERVICE_SET_TEMPERATURE} on {entity.entity_id}",
+                translation_domain=DOMAIN,
+                translation_key="integer_required",
+                translation_placeholders={
+                    "entity_id": entity.entity_id,
+                },
+            )
+
+        value = int(value)
+    return value
+
+
+# value conversion of the set services by feature, also used for bulk writes
+_CONVERTERS: dict[SensorFeatures, Callable[[Any | None, IdmHeatpumpEntity], Any]] = {
+    SensorFeatures.SET_POWER: lambda v, _: float(v),
+    SensorFeatures.SET_BATTERY: lambda v, _: int(v),
+    SensorFeatures.SET_TEMPERATURE: _convert_temperature,
+    SensorFeatures.SET_HUMIDITY: lambda v, _: float(v),
+    SensorFeatures.SET_ROOM_MODE: lambda v, _: RoomMode[v],
+    SensorFeatures.SET_BINARY: lambda v, _: bool(v),
+    SensorFeatures.SET_SYSTEM_STATUS: lambda v, _: SystemStatus[v],
+    SensorFeatures.SET_CIRCUIT_MODE: lambda v, _: CircuitMode[v],
+}
+
+
+def _check_acknowledged(service: str, call: ServiceCall):
+    acknowledge = call.data.get("acknowledge_risk")
+    if acknowledge is not True:
+        raise HomeAssistantError(
+            f"Must acknowledge risk to call {service}",
+            translation_domain=DOMAIN,
+            translation_key="risk_not_acknowledged",
+        )
+
+
 async def _handle_set(
     platform_domain: str,
     hass: HomeAssistant,
@@ -51,13 +104,7 @@ async def _handle_set(
 
     entity: IdmHeatpumpEntity
 
-    acknowledge = call.data.get("acknowledge_risk")
-    if acknowledge is not True:
-        raise HomeAssistantError(
-            f"Must acknowledge risk to call {service}",
-            translation_domain=DOMAIN,
-            translation_key="risk_not_acknowledged",
-        )
+    _check_acknowledged(service, call)
 
     raw_value = call.data.get("value")
     value = convert_value(raw_value, entity)
@@ -79,7 +126,6 @@ def register_set_service(
     hass: HomeAssistant,
     service: str,
     feature: SensorFeatures,
-    convert_value: Callable[[Any | None, IdmHeatpumpEntity], _T],
 ):
     """Register a service for setting a register."""
 
@@ -92,6 +138,108 @@ def register_set_service(
             hass,
             service,
             feature,
-            convert_value,
+            _CONVERTERS[feature],
         ),
     )
+
+
+def _convert_item(
+    hass: HomeAssistant, target: str | None, raw_value: Any | None
+) -> tuple[IdmHeatpumpEntity, Any]:
+    entity = None
+    for platform in entity_platform.async_get_platforms(hass, DOMAIN):
+        entity = platform.entities.get(target, entity)
+
+    convert_value = None
+    if isinstance(entity, IdmHeatpumpEntity):
+        convert_value = next(
+            (
+                convert
+                for feature, convert in _CONVERTERS.items()
+                if feature in entity.supported_features
+            ),
+            None,
+        )
+
+    if convert_value is None:
+        raise HomeAssistantError(f"Entity {target} does not support writing values.")
+
+    try:
+        value = convert_value(raw_value, entity)
+    except (KeyError, TypeError, ValueError) as error:
+        raise HomeAssistantError(f"invalid value: {raw_value}") from error
+
+    if value is None:
+        raise HomeAssistantError(f"invalid value: {raw_value}")
+
+    return entity, value
+
+
+async def _handle_write_values(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    _check_acknowledged(SERVICE_WRITE_VALUES, call)
+
+    items: list[dict[str, Any]] = call.data.get("values") or []
+    results: list[dict[str, Any]] = [
+        {"target": item.get("target"), "success": False, "error": None}
+        for item in items
+    ]
+
+    # entities of different config entries are written by their own heat pump
+    writes: dict[
+        IdmHeatpumpDataUpdateCoordinator, list[tuple[int, IdmHeatpumpEntity, Any]]
+    ] = {}
+    for index, item in enumerate(items):
+        try:
+            entity, value = _convert_item(hass, item.get("target"), item.get("value"))
+        except HomeAssistantError as error:
+            results[index]["error"] = str(error)
+            continue
+        writes.setdefault(entity.coordinator, []).append((index, entity, value))
+
+    for coordinator, entries in writes.items():
+        LOGGER.debug(
+            "Calling %s with values %s",
+            SERVICE_WRITE_VALUES,
+            {entity.entity_id: value for _, entity, value in entries},
+        )
+        try:
+            errors = await coordinator.async_write_values(
+                [(entity.sensor_address, value) for _, entity, value in entries]
+            )
+        except TimeoutError as error:
+            errors = [error] * len(entries)
+
+        for (index, _, _), error in zip(entries, errors, strict=True):
+            if error is None:
+                results[index]["success"] = True
+            else:
+                results[index]["error"] = str(error) or type(error).__name__
+
+    failed = [str(r["target"]) for r in results if not r["success"]]
+    if failed and not call.return_response:
+        raise HomeAssistantError(
+            f"Writing values failed for {', '.join(failed)}",
+            translation_domain=DOMAIN,
+            translation_key="write_failed",
+            translation_placeholders={
+                "targets": ", ".join(failed),
+            },
+        )
+
+    return {"results": results}
+
+
+def register_write_values_service(hass: HomeAssistant):
+    """Register the service for writing multiple registers at once."""
+
+    if hass.services.has_service(DOMAIN, SERVICE_WRITE_VALUES):
+        return
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_WRITE_VALUES,
+        service_func=partial(_handle_write_values, hass),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,205 @@
+"""Coalescing of frequent writes to the same registers."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import Enum
+
+from .logger import LOGGER
+from .sensor_addresses import BaseSensorAddress
+
+WriteValues = Callable[
+    [list[tuple[BaseSensorAddress, any]]], Awaitable[list[Exception | None]]
+]
+
+
+@dataclass
+class _PendingWrite:
+    address: BaseSensorAddress
+    value: any
+    # loop time at which the window of the value ends
+    due: float
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+class WriteScheduler:
+    """Coalesces writes before they are sent to the heat pump.
+
+    Values are held back for `window` seconds, a newer value for the same
+    address replaces a value that wasn't written yet. Numeric values within
+    `deadband` of the last written value are skipped and every address is
+    written at most once per `min_interval` seconds. Values that are due at
+    the same time are passed to `write` together, so that contiguous
+    registers end up in a single transaction.
+    """
+
+    def __init__(
+        self,
+        write: WriteValues,
+        window: float = 0.0,
+        deadband: float = 0.0,
+        min_interval: float = 0.0,
+    ) -> None:
+        """Create scheduler writing values with `write`."""
+        self._write = write
+        self.window = window
+        self.deadband = deadband
+        self.min_interval = min_interval
+
+        self._pending: dict[str, _PendingWrite] = {}
+        # loop time and value of the last successful write per address
+        self._last_written: dict[str, tuple[float, any]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._closed = False
+
+        self.writes = 0
+        self.coalesced = 0
+        self.skipped = 0
+
+    def _within_deadband(self, last_value: any, value: any, deadband: float) -> bool:
+        if deadband <= 0.0:
+            return False
+        if isinstance(value, bool | Enum) or not isinstance(value, int | float):
+            return False
+        return abs(value - last_value) <= deadband
+
+    def _due(self, pending: _PendingWrite) -> float:
+        last = self._last_written.get(pending.address.name)
+        if last is None:
+            return pending.due
+        return max(pending.due, last[0] + self.min_interval)
+
+    async def async_write(
+        self, address: BaseSensorAddress, value: any, deadband: float | None = None
+    ):
+        """Write a value, returns once it or a newer value was written or skipped.
+
+        `deadband` replaces the deadband of the scheduler for this value.
+        """
+        if self._closed:
+            raise RuntimeError("write scheduler is closed")
+
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(address.name)
+        last = self._last_written.get(address.name)
+
+        if last is not None and self._within_deadband(
+            last[1], value, self.deadband if deadband is None else deadband
+        ):
+            LOGGER.debug("skipping write of %s for %s", value, address.name)
+            self.skipped += 1
+            if pending is not None:
+                # the heat pump already has the latest value
+                del self._pending[address.name]
+                self.coalesced += 1
+                for future in pending.futures:
+                    if not future.done():
+                        future.set_result(None)
+            return
+
+        future = loop.create_future()
+        if pending is None:
+            self._pending[address.name] = _PendingWrite(
+                address, value, loop.time() + self.window, [future]
+            )
+        else:
+            LOGGER.debug("replacing pending write for %s", address.name)
+            self.coalesced += 1
+            pending.value = value
+            pending.futures.append(future)
+
+        self._schedule()
+        await future
+
+    async def async_write_values(
+        self, values: list[tuple[BaseSensorAddress, any]]
+    ) -> list[Exception | None]:
+        """Write multiple values, returns `None` or the error for each value."""
+        results = await asyncio.gather(
+            *(self.async_write(address, value) for address, value in values),
+            return_exceptions=True,
+        )
+        return [result if isinstance(result, Exception) else None for result in results]
+
+    def _schedule(self):
+        if self._closed or self._flush_task is not None:
+            # the running flush schedules the next one when done
+            return
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if len(self._pending) == 0:
+            return
+
+        loop = asyncio.get_running_loop()
+        due = min(self._due(pending) for pending in self._pending.values())
+        self._timer = loop.call_at(due, self._start_flush)
+
+    def _start_flush(self):
+        self._timer = None
+        self._flush_task = asyncio.get_running_loop().create_task(self._async_flush())
+
+    async def _async_flush(self, everything: bool = False):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        due = [
+            pending
+            for pending in self._pending.values()
+            if everything or self._due(pending) <= now
+        ]
+        for pending in due:
+            del self._pending[pending.address.name]
+
+        try:
+            if len(due) > 0:
+                try:
+                    errors = await self._write(
+                        [(pending.address, pending.value) for pending in due]
+                    )
+                except Exception as error:  # pylint: disable=broad-except
+                    errors = [error] * len(due)
+
+                now = loop.time()
+                for pending, error in zip(due, errors, strict=True):
+                    if error is None:
+                        self.writes += 1
+                        self._last_written[pending.address.name] = (
+                            now,
+                            pending.value,
+                        )
+                    for future in pending.futures:
+                        if future.done():
+                            continue
+                        if error is None:
+                            future.set_result(None)
+                        else:
+                            future.set_exception(error)
+        finally:
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None
+            self._schedule()
+
+    async def async_shutdown(self):
+        """Write all pending values immediately and stop scheduling."""
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._async_flush(everything=True)
+
+    def as_dict(self) -> dict[str, any]:
+        """Return settings and counters for diagnostics."""
+        return {
+            "window": self.window,
+            "deadband": self.deadband,
+            "min_interval": self.min_interval,
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+            "pending": sorted(self._pending),
+        }
@@ -0,0 +1,8 @@
+"""Make the integration and the development tools importable in tests."""
+
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).parent.parent
+
+sys.path[:0] = [str(_ROOT / "custom_components"), str(_ROOT)]
@@ -0,0 +1,149 @@
+"""Tests of reading the heat pump."""
+
+import asyncio
+
+import pytest
+from idm_heatpump.const import MODBUS_MAX_READ_COUNT, PollTier
+from idm_heatpump.group_planner import SensorGroup
+from idm_heatpump.idm_heatpump import IdmHeatpump
+from idm_heatpump.sensor_addresses import BaseSensorAddress, HeatingCircuit
+
+from tools.simulator import SimulatedController, register_map
+
+
+async def _poll(controller: SimulatedController, cycles: int) -> IdmHeatpump:
+    server = await controller.serve("127.0.0.1", 0)
+    heatpump = IdmHeatpump(
+        "127.0.0.1",
+        circuits=list(HeatingCircuit),
+        zones=[],
+        no_groups=False,
+        max_power_usage=None,
+        port=server.sockets[0].getsockname()[1],
+    )
+    try:
+        for _ in range(cycles):
+            await heatpump.async_get_data()
+    finally:
+        heatpump.close()
+        server.close()
+    return heatpump
+
+
+async def _poll_twice(decodes: list[str]) -> tuple[dict, dict]:
+    controller = SimulatedController(
+        register_map([HeatingCircuit.A], []), refresh_interval=None, seed=1
+    )
+    server = await controller.serve("127.0.0.1", 0)
+    heatpump = IdmHeatpump(
+        "127.0.0.1",
+        circuits=[HeatingCircuit.A],
+        zones=[],
+        no_groups=False,
+        max_power_usage=None,
+        port=server.sockets[0].getsockname()[1],
+    )
+    try:
+        # let the heat pump learn its group size first
+        for _ in range(3):
+            _, first = await heatpump.async_get_data()
+        decodes.clear()
+        # replanning must not lose the registers of the last read
+        heatpump.restore_learned_state(heatpump.learned_state())
+        _, second = await heatpump.async_get_data()
+    finally:
+        heatpump.close()
+        server.close()
+    return first, second
+
+
+def test_unchanged_registers_are_not_decoded(monkeypatch: pytest.MonkeyPatch):
+    """A second poll of an unchanged controller reuses the decoded values."""
+    decodes: list[str] = []
+    unpack = SensorGroup.unpack
+    decode = BaseSensorAddress.decode
+
+    def counting_unpack(group: SensorGroup, registers: list[int]) -> tuple:
+        decodes.append(f"group {group.start}")
+        return unpack(group, registers)
+
+    def counting_decode(sensor: BaseSensorAddress, registers: list[int]):
+        decodes.append(sensor.name)
+        return decode(sensor, registers)
+
+    monkeypatch.setattr(SensorGroup, "unpack", counting_unpack)
+    monkeypatch.setattr(BaseSensorAddress, "decode", counting_decode)
+
+    first, second = asyncio.run(_poll_twice(decodes))
+
+    assert len(first) > 0
+    assert second == first
+    assert decodes == []
+
+
+def test_transient_faults_do_not_degrade_the_plan():
+    """Single error responses are not blamed on the gaps or size of a group."""
+    sensors = register_map(list(HeatingCircuit), [])
+    reliable = asyncio.run(
+        _poll(SimulatedController(sensors, refresh_interval=None, seed=1), 20)
+    )
+    faulty = asyncio.run(
+        _poll(
+            SimulatedController(
+                sensors, fault_rate=0.05, refresh_interval=None, seed=1
+            ),
+            100,
+        )
+    )
+
+    assert faulty.diagnostics()["learned"]["no_bridge"] == []
+    assert faulty.learned_state() == reliable.learned_state()
+    assert len(faulty.sensor_groups) == len(reliable.sensor_groups)
+
+
+def test_rejected_gaps_are_not_read_again():
+    """Only the gaps the controller rejects are excluded from group reads."""
+    controller = SimulatedController(
+        register_map(list(HeatingCircuit), []),
+        unmapped_illegal=True,
+        refresh_interval=None,
+        seed=1,
+    )
+    heatpump = asyncio.run(_poll(controller, 30))
+    no_bridge = heatpump.diagnostics()["learned"]["no_bridge"]
+
+    # one address per rejected gap, not every sensor of the failed groups
+    assert 0 < len(no_bridge) < len(heatpump.sensors) // 10
+    assert heatpump.learned_state()["max_group_size_ceiling"] == MODBUS_MAX_READ_COUNT
+
+
+async def _create(**kwargs) -> IdmHeatpump:
+    heatpump = IdmHeatpump(
+        "127.0.0.1",
+        circuits=[HeatingCircuit.A, HeatingCircuit.B],
+        zones=[],
+        no_groups=False,
+        max_power_usage=None,
+        **kwargs,
+    )
+    heatpump.close()
+    return heatpump
+
+
+def test_tier_overrides():
+    """Sensors can be moved to another tier by name or pattern."""
+    heatpump = asyncio.run(
+        _create(
+            tier_sensors={
+                PollTier.FAST: ["curve_circuit_a"],
+                PollTier.NORMAL: ["curve_circuit_*"],
+            }
+        )
+    )
+
+    assert heatpump.sensor_tiers["curve_circuit_a"] == PollTier.FAST
+    assert heatpump.sensor_tiers["curve_circuit_b"] == PollTier.NORMAL
+    assert heatpump.sensor_tiers["temp_threshold_heating_circuit_a"] == PollTier.SLOW
+    assert "curve_circuit_a" in {
+        s.name for g in heatpump.plan_for(frozenset({PollTier.FAST})) for s in g.sensors
+    }
@@ -0,0 +1,19 @@
+"""Tests of the request metrics."""
+
+from idm_heatpump.metrics import HeatpumpMetrics
+
+
+def test_prune_keeps_totals():
+    """Pruned ranges disappear from the groups but not from the totals."""
+    metrics = HeatpumpMetrics()
+    metrics.group(0, 10).record_success(0.01, [0] * 10)
+    metrics.group(0, 5).record_error(0.01)
+    metrics.group(5, 5).record_timeout(0.01)
+
+    metrics.prune([(0, 10)])
+
+    assert list(metrics.groups) == [(0, 10)]
+    assert metrics.total("requests") == 3
+    assert metrics.total("errors") == 1
+    assert metrics.total("timeouts") == 1
+    assert metrics.as_dict()["pruned"]["requests"] == 2
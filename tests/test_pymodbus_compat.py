@@ -0,0 +1,107 @@
+"""Tests of the compatibility with both pymodbus API styles."""
+
+import importlib
+from collections.abc import Iterator
+
+import pytest
+from idm_heatpump import pymodbus_compat
+from pymodbus.client.mixin import ModbusClientMixin
+
+DATATYPE = ModbusClientMixin.DATATYPE.UINT32
+
+
+class _Client:
+    """Records the keyword arguments of read and write requests."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+
+    def read_input_registers(self, **kwargs):
+        self.calls.append(("read_input_registers", kwargs))
+
+    def write_registers(self, **kwargs):
+        self.calls.append(("write_registers", kwargs))
+
+
+def _read_input_registers_device_id(self, address, *, count=1, device_id=1):
+    """Signature of pymodbus 3.10 and newer."""
+
+
+def _read_input_registers_slave(self, address, *, count=1, slave=1):
+    """Signature of older pymodbus versions."""
+
+
+def _convert_to_registers_word_order(value, data_type, word_order="big"):
+    """Signature of pymodbus versions supporting the word order."""
+    assert word_order == "little"
+    return [0x5678, 0x1234]
+
+
+def _convert_to_registers_big_endian(value, data_type):
+    """Signature of older pymodbus versions, always high word first."""
+    return [0x1234, 0x5678]
+
+
+@pytest.fixture
+def reload_compat(monkeypatch: pytest.MonkeyPatch) -> Iterator:
+    """Reload the module with patched pymodbus signatures."""
+
+    def reload(read_input_registers, convert_to_registers):
+        monkeypatch.setattr(
+            ModbusClientMixin, "read_input_registers", read_input_registers
+        )
+        monkeypatch.setattr(
+            ModbusClientMixin,
+            "convert_to_registers",
+            staticmethod(convert_to_registers),
+        )
+        return importlib.reload(pymodbus_compat)
+
+    yield reload
+
+    monkeypatch.undo()
+    importlib.reload(pymodbus_compat)
+
+
+@pytest.mark.parametrize(
+    ("read_input_registers", "keyword"),
+    [
+        (_read_input_registers_device_id, "device_id"),
+        (_read_input_registers_slave, "slave"),
+    ],
+)
+def test_device_id_keyword(reload_compat, read_input_registers, keyword: str):
+    """The device id is passed with the keyword of the installed version."""
+    compat = reload_compat(read_input_registers, _convert_to_registers_word_order)
+    client = _Client()
+
+    compat.read_input_registers(client, address=1000, count=2)
+    compat.write_registers(client, address=1000, values=[1, 2])
+
+    assert client.calls == [
+        ("read_input_registers", {"address": 1000, "count": 2, keyword: 1}),
+        ("write_registers", {"address": 1000, "values": [1, 2], keyword: 1}),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("convert_to_registers", "has_word_order"),
+    [
+        (_convert_to_registers_word_order, True),
+        (_convert_to_registers_big_endian, False),
+    ],
+)
+def test_word_order(reload_compat, convert_to_registers, has_word_order: bool):
+    """Values are converted with the low word first by either version."""
+    compat = reload_compat(_read_input_registers_device_id, convert_to_registers)
+
+    assert compat.HAS_WORD_ORDER is has_word_order
+    assert compat.convert_to_registers(0x12345678, DATATYPE) == [0x5678, 0x1234]
+
+
+def test_installed_version():
+    """The installed version converts values with the low word first."""
+    assert pymodbus_compat.convert_to_registers(0x12345678, DATATYPE) == [
+        0x5678,
+        0x1234,
+    ]
@@ -0,0 +1 @@
+"""Development tools for the IDM heat pump integration."""
@@ -0,0 +1,154 @@
+"""Benchmark creating entities and looking up their unique ids and devices.
+
+Run from the repository root:
+
+    PYTHONPATH=custom_components python -m tools.benchmark_entities --output after.json
+
+For each setup the entity tables are built and the sensor and binary sensor
+entities of one config entry are created. Then `unique_id` and `device_info`
+of every entity are read repeatedly, like the entity and device registries do
+while entities are added. Pass the JSON written by a previous run as
+`--baseline` to compare two versions.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from types import SimpleNamespace
+
+from idm_heatpump.binary_sensor import IdmHeatpumpBinarySensor
+from idm_heatpump.const import (
+    CONF_DISPLAY_NAME,
+    CONF_HOSTNAME,
+    MAX_ROOM_COUNT,
+    MAX_ZONE_COUNT,
+)
+from idm_heatpump.entity_tables import EntityTables
+from idm_heatpump.sensor import IdmHeatpumpSensor
+from idm_heatpump.sensor_addresses import (
+    BINARY_SENSOR_ADDRESSES,
+    SENSOR_ADDRESSES,
+    BaseSensorAddress,
+    HeatingCircuit,
+    IdmBinarySensorAddress,
+    ZoneModule,
+    heating_circuit_sensors,
+)
+
+_SETUPS = {
+    "minimal": ([], 0),
+    "circuits": (list(HeatingCircuit), 0),
+    "zones": ([], MAX_ZONE_COUNT),
+    "full": (list(HeatingCircuit), MAX_ZONE_COUNT),
+}
+
+
+def _sensors(setup: str) -> list[BaseSensorAddress]:
+    """Return the sensors of a setup, like `IdmHeatpump` does."""
+    circuits, zone_count = _SETUPS[setup]
+    zones = [ZoneModule(i, MAX_ROOM_COUNT, True) for i in range(zone_count)]
+    return [
+        *SENSOR_ADDRESSES.values(),
+        *BINARY_SENSOR_ADDRESSES.values(),
+        *[s for c in circuits for s in heating_circuit_sensors(c)],
+        *[s for zone in zones for s in zone.sensors()],
+        *[s for zone in zones for s in zone.binary_sensors()],
+    ]
+
+
+def _run(args: argparse.Namespace, setup: str) -> dict[str, any]:
+    sensors = _sensors(setup)
+
+    config_entry = SimpleNamespace(
+        entry_id="benchmark",
+        data={CONF_HOSTNAME: "192.168.0.1", CONF_DISPLAY_NAME: "Heat Pump"},
+    )
+
+    setup_times: list[float] = []
+    lookup_times: list[float] = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        coordinator = SimpleNamespace(entity_tables=EntityTables(config_entry, sensors))
+        entities = [
+            IdmHeatpumpBinarySensor(coordinator, config_entry, address)
+            if isinstance(address, IdmBinarySensorAddress)
+            else IdmHeatpumpSensor(coordinator, config_entry, address)
+            for address in sensors
+        ]
+        setup_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(args.lookups):
+            for entity in entities:
+                _ = entity.unique_id
+                _ = entity.device_info
+        lookup_times.append(time.perf_counter() - start)
+
+    return {
+        "setup": setup,
+        "entities": len(entities),
+        "devices": len({entity.device_info["name"] for entity in entities}),
+        "setup_ms": statistics.median(setup_times) * 1000,
+        "lookup_us_per_entity": statistics.median(lookup_times)
+        / args.lookups
+        / len(entities)
+        * 1_000_000,
+    }
+
+
+def _change(value: float, baseline: float) -> str:
+    if not baseline:
+        return ""
+    return f" ({(value - baseline) / baseline:+.0%})"
+
+
+def _main(args: argparse.Namespace):
+    results = [_run(args, setup) for setup in args.setups]
+
+    baseline: dict[str, dict[str, any]] = {}
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = {r["setup"]: r for r in json.load(file)["results"]}
+
+    print(f"{'setup':>8} {'entities':>8} {'devices':>7} {'setup':>9} {'lookup':>10}")
+    for r in results:
+        b = baseline.get(r["setup"], {})
+        print(
+            f"{r['setup']:>8} {r['entities']:>8} {r['devices']:>7}"
+            f" {r['setup_ms']:>7.1f}ms {r['lookup_us_per_entity']:>8.2f}us"
+            + _change(r["setup_ms"], b.get("setup_ms"))
+            + _change(r["lookup_us_per_entity"], b.get("lookup_us_per_entity"))
+        )
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "repeat": args.repeat,
+                    "lookups": args.lookups,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--setups", nargs="*", choices=list(_SETUPS), default=list(_SETUPS)
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--lookups", type=int, default=10, help="reads of each property per entity"
+    )
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON of a previous run to compare with")
+
+    _main(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Benchmark poll cycles for different setups and grouping strategies.
+
+Run from the repository root:
+
+    PYTHONPATH=custom_components python -m tools.benchmark_poll --output after.json
+
+Each combination of setup, grouping mode and latency polls an in-process
+simulator (see `tools.simulator`) with fresh values for every cycle. Pass the
+JSON written by a previous run as `--baseline` to compare two versions.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from idm_heatpump.const import MAX_ROOM_COUNT, MAX_ZONE_COUNT
+from idm_heatpump.idm_heatpump import IdmHeatpump
+from idm_heatpump.sensor_addresses import HeatingCircuit, ZoneModule
+
+from .simulator import SimulatedController, register_map
+
+_SETUPS = {
+    "minimal": ([], 0),
+    "circuits": (list(HeatingCircuit), 0),
+    "zones": ([], MAX_ZONE_COUNT),
+}
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def _run(
+    args: argparse.Namespace, setup: str, no_groups: bool, latency: float
+) -> dict[str, any]:
+    circuits, zone_count = _SETUPS[setup]
+    zones = [ZoneModule(i, MAX_ROOM_COUNT, True) for i in range(zone_count)]
+
+    controller = SimulatedController(
+        register_map(circuits, zones),
+        latency=latency / 1000,
+        capacity=args.capacity,
+        refresh_interval=None,
+        seed=args.seed,
+    )
+    server = await controller.serve("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    heatpump = IdmHeatpump(
+        "127.0.0.1",
+        circuits=circuits,
+        zones=zones,
+        no_groups=no_groups,
+        max_power_usage=None,
+        port=port,
+    )
+
+    # let the heat pump learn its limits first
+    for _ in range(args.warmup):
+        controller.refresh()
+        await heatpump.async_get_data()
+
+    stats = controller.stats
+    requests, bytes_sent, bytes_received = (
+        stats.requests,
+        stats.bytes_sent,
+        stats.bytes_received,
+    )
+    decode_seconds = heatpump.decode_seconds
+
+    cycle_times: list[float] = []
+    failed_cycles = 0
+    for _ in range(args.cycles):
+        controller.refresh()
+        start = time.perf_counter()
+        try:
+            has_error, _ = await heatpump.async_get_data()
+            failed_cycles += has_error
+        except Exception:  # pylint: disable=broad-except
+            failed_cycles += 1
+        cycle_times.append(time.perf_counter() - start)
+
+    heatpump.close()
+    server.close()
+
+    return {
+        "setup": setup,
+        "no_groups": no_groups,
+        "latency_ms": latency,
+        "sensors": len(heatpump.sensors),
+        "requests_per_cycle": (stats.requests - requests) / args.cycles,
+        "bytes_per_cycle": (
+            stats.bytes_sent - bytes_sent + stats.bytes_received - bytes_received
+        )
+        / args.cycles,
+        "cycle_p50_ms": _percentile(cycle_times, 50) * 1000,
+        "cycle_p95_ms": _percentile(cycle_times, 95) * 1000,
+        "decode_ms_per_cycle": (heatpump.decode_seconds - decode_seconds)
+        / args.cycles
+        * 1000,
+        "failed_cycles": failed_cycles,
+    }
+
+
+def _key(result: dict[str, any]) -> tuple:
+    return (result["setup"], result["no_groups"], result["latency_ms"])
+
+
+def _change(value: float, baseline: float) -> str:
+    if not baseline:
+        return ""
+    return f" ({(value - baseline) / baseline:+.0%})"
+
+
+async def _main(args: argparse.Namespace):
+    results = [
+        await _run(args, setup, no_groups, latency)
+        for setup in args.setups
+        for no_groups in (False, True)
+        for latency in args.latencies
+    ]
+
+    baseline: dict[tuple, dict[str, any]] = {}
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = {_key(r): r for r in json.load(file)["results"]}
+
+    print(
+        f"{'setup':>8} {'mode':>9} {'latency':>7} {'req/cycle':>9} {'bytes':>7}"
+        f" {'cycle p50':>10} {'cycle p95':>10} {'decode':>8} {'failed':>6}"
+    )
+    for r in results:
+        b = baseline.get(_key(r), {})
+        print(
+            f"{r['setup']:>8} {'single' if r['no_groups'] else 'grouped':>9}"
+            f" {r['latency_ms']:>5.0f}ms {r['requests_per_cycle']:>9.1f}"
+            f" {r['bytes_per_cycle']:>7.0f}"
+            f" {r['cycle_p50_ms']:>8.0f}ms {r['cycle_p95_ms']:>8.0f}ms"
+            f" {r['decode_ms_per_cycle']:>6.2f}ms {r['failed_cycles']:>6}"
+            + _change(r["requests_per_cycle"], b.get("requests_per_cycle"))
+            + _change(r["cycle_p50_ms"], b.get("cycle_p50_ms"))
+        )
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "cycles": args.cycles,
+                    "capacity": args.capacity,
+                    "seed": args.seed,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--setups", nargs="*", choices=list(_SETUPS), default=list(_SETUPS)
+    )
+    parser.add_argument(
+        "--latencies",
+        type=lambda s: [float(w) for w in s.split(",")],
+        default=[0, 10],
+        help="comma separated list of latencies per request in ms",
+    )
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--capacity", type=int, default=1, help="concurrent requests of simulator"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON of a previous run to compare with")
+
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Benchmark poll cycles for different request window sizes.
+
+Run from the repository root, either against a real controller:
+
+    PYTHONPATH=custom_components python -m tools.benchmark_window --host 192.168.1.10
+
+or, without `--host`, against a stub that emulates a controller which
+handles a limited number of requests at a time and drops requests when
+its queue is full.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from idm_heatpump.const import MODBUS_PORT
+from idm_heatpump.idm_heatpump import IdmHeatpump
+from idm_heatpump.sensor_addresses import HeatingCircuit, ZoneModule
+
+from .stub_response import RegistersResponse
+
+
+class _StubClient:
+    """Stand-in for AsyncModbusTcpClient with a simple controller model."""
+
+    connected = True
+
+    def __init__(
+        self,
+        latency: float,
+        register_latency: float,
+        capacity: int,
+        queue_size: int,
+    ):
+        self._latency = latency
+        self._register_latency = register_latency
+        self._busy = asyncio.Semaphore(capacity)
+        self._queue_size = queue_size
+        self._pending = 0
+
+    async def connect(self):
+        self.connected = True
+
+    def close(self):
+        self.connected = False
+
+    async def read_input_registers(self, address: int, count: int, **kwargs):
+        if self._pending >= self._queue_size:
+            # controller is flooded, the request is never answered
+            await asyncio.Event().wait()
+
+        self._pending += 1
+        try:
+            async with self._busy:
+                await asyncio.sleep(self._latency + count * self._register_latency)
+        finally:
+            self._pending -= 1
+
+        return RegistersResponse([0] * count)
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def _run_window(args: argparse.Namespace, window: int) -> dict[str, any]:
+    heatpump = IdmHeatpump(
+        args.host or "localhost",
+        circuits=[HeatingCircuit[c] for c in args.circuits],
+        zones=[ZoneModule(i, args.rooms, False) for i in range(args.zones)],
+        no_groups=args.no_groups,
+        max_power_usage=None,
+        max_concurrent_requests=window,
+        request_deadline=timedelta(seconds=args.deadline),
+        port=args.port,
+    )
+    if args.host is None:
+        heatpump.client = _StubClient(
+            latency=args.latency / 1000,
+            register_latency=args.register_latency / 1000,
+            capacity=args.capacity,
+            queue_size=args.queue_size,
+        )
+
+    request_times: list[float] = []
+    read = heatpump.client.read_input_registers
+
+    async def timed_read(address: int, count: int, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await read(address=address, count=count, **kwargs)
+        finally:
+            request_times.append(time.perf_counter() - start)
+
+    heatpump.client.read_input_registers = timed_read
+
+    cycle_times: list[float] = []
+    failed_cycles = 0
+    for _ in range(args.cycles):
+        start = time.perf_counter()
+        try:
+            has_error, _ = await heatpump.async_get_data()
+            failed_cycles += has_error
+        except Exception:  # pylint: disable=broad-except
+            failed_cycles += 1
+        cycle_times.append(time.perf_counter() - start)
+
+    heatpump.close()
+
+    total_time = sum(cycle_times)
+    return {
+        "window": window,
+        "requests_per_cycle": len(request_times) / args.cycles,
+        "cycle_p50_ms": _percentile(cycle_times, 50) * 1000,
+        "cycle_p95_ms": _percentile(cycle_times, 95) * 1000,
+        "request_p50_ms": _percentile(request_times, 50) * 1000,
+        "request_p95_ms": _percentile(request_times, 95) * 1000,
+        "requests_per_second": len(request_times) / total_time if total_time else 0,
+        "failed_cycles": failed_cycles,
+    }
+
+
+async def _main(args: argparse.Namespace):
+    results = [await _run_window(args, window) for window in args.windows]
+
+    print(
+        f"{'window':>6} {'req/cycle':>9} {'cycle p50':>10} {'cycle p95':>10}"
+        f" {'req p50':>8} {'req p95':>8} {'req/s':>7} {'failed':>6}"
+    )
+    for r in results:
+        print(
+            f"{r['window']:>6} {r['requests_per_cycle']:>9.1f}"
+            f" {r['cycle_p50_ms']:>8.0f}ms {r['cycle_p95_ms']:>8.0f}ms"
+            f" {r['request_p50_ms']:>6.0f}ms {r['request_p95_ms']:>6.0f}ms"
+            f" {r['requests_per_second']:>7.1f} {r['failed_cycles']:>6}"
+        )
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", help="controller to benchmark, uses a stub if unset")
+    parser.add_argument("--port", type=int, default=MODBUS_PORT)
+    parser.add_argument(
+        "--windows",
+        type=lambda s: [int(w) for w in s.split(",")],
+        default=[1, 2, 4, 8, 16],
+        help="comma separated list of window sizes",
+    )
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--circuits", nargs="*", default=["A"])
+    parser.add_argument("--zones", type=int, default=0)
+    parser.add_argument("--rooms", type=int, default=8)
+    parser.add_argument("--no-groups", action="store_true")
+    parser.add_argument("--deadline", type=float, default=5, help="seconds")
+    parser.add_argument("--output", help="write results as JSON")
+    stub = parser.add_argument_group("stub controller")
+    stub.add_argument("--latency", type=float, default=100, help="ms per request")
+    stub.add_argument(
+        "--register-latency", type=float, default=0.5, help="ms per register"
+    )
+    stub.add_argument("--capacity", type=int, default=1)
+    stub.add_argument("--queue-size", type=int, default=8)
+
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
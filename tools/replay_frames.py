@@ -0,0 +1,145 @@
+"""Replay raw register frames recorded by the integration.
+
+Run from the repository root with a file written by the "record raw
+registers" option:
+
+    PYTHONPATH=custom_components python -m tools.replay_frames config/idm_heatpump/heatpump.frames --circuits A
+
+Every recorded cycle is decoded by `IdmHeatpump` as if it was read from the
+controller. Requests that were recorded are answered with the recorded
+registers in order, any other request with the latest recorded value of each
+register. Use the same circuits and zones as the recorded installation.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import deque
+from collections.abc import Iterator
+
+from idm_heatpump.frame_recorder import RecordedFrame, read_frames
+from idm_heatpump.idm_heatpump import IdmHeatpump
+from idm_heatpump.sensor_addresses import HeatingCircuit, ZoneModule
+
+from .stub_response import RegistersResponse
+
+
+class _ReplayClient:
+    """Stand-in for AsyncModbusTcpClient serving recorded frames."""
+
+    connected = True
+
+    def __init__(self):
+        self._registers: dict[int, int] = {}
+        self._frames: dict[tuple[int, int], deque[tuple[int, ...]]] = {}
+
+    def load_cycle(self, frames: list[RecordedFrame]):
+        self._frames = {}
+        for frame in frames:
+            self._frames.setdefault(
+                (frame.start, len(frame.registers)), deque()
+            ).append(frame.registers)
+            for i, register in enumerate(frame.registers):
+                self._registers[frame.start + i] = register
+
+    async def connect(self):
+        self.connected = True
+
+    def close(self):
+        self.connected = False
+
+    async def read_input_registers(self, address: int, count: int, **kwargs):
+        frames = self._frames.get((address, count))
+        if frames:
+            return RegistersResponse(list(frames.popleft()))
+        return RegistersResponse(
+            [self._registers.get(a, 0) for a in range(address, address + count)]
+        )
+
+
+def _cycles(path: str) -> Iterator[tuple[float, list[RecordedFrame]]]:
+    timestamp, frames = None, []
+    for frame in read_frames(path):
+        if len(frame.registers) == 0:
+            if frames:
+                yield timestamp, frames
+            timestamp, frames = frame.timestamp, []
+        else:
+            if timestamp is None:
+                timestamp = frame.timestamp
+            frames.append(frame)
+    if frames:
+        yield timestamp, frames
+
+
+async def _main(args: argparse.Namespace):
+    heatpump = IdmHeatpump(
+        "localhost",
+        circuits=[HeatingCircuit[c] for c in args.circuits],
+        zones=[ZoneModule(i, args.rooms, args.room_9_relay) for i in range(args.zones)],
+        no_groups=args.no_groups,
+        max_power_usage=args.max_power_usage,
+    )
+    heatpump.close()
+    client = heatpump.client = _ReplayClient()
+
+    previous: dict[str, any] = {}
+    cycles = 0
+    failed_cycles = 0
+    for timestamp, frames in _cycles(args.file):
+        client.load_cycle(frames)
+        cycles += 1
+
+        try:
+            has_error, data = await heatpump.async_get_data()
+            failed_cycles += has_error
+        except Exception as error:  # pylint: disable=broad-except
+            print(f"{time.ctime(timestamp)}: failed: {error!r}")
+            failed_cycles += 1
+            continue
+
+        if args.show == "all":
+            changed = data
+        elif args.show == "changes":
+            changed = {
+                name: value
+                for name, value in data.items()
+                if name not in previous or previous[name] != value
+            }
+        else:
+            changed = {}
+        previous = data
+
+        if changed:
+            print(f"{time.ctime(timestamp)}:")
+            for name, value in sorted(changed.items()):
+                print(f"  {name}: {value}")
+
+    print(
+        f"replayed {cycles} cycles ({failed_cycles} failed),"
+        f" decoding took {heatpump.decode_seconds * 1000:.1f}ms"
+    )
+
+
+def main():
+    """Replay frames."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file")
+    parser.add_argument("--circuits", nargs="*", default=["A"])
+    parser.add_argument("--zones", type=int, default=0)
+    parser.add_argument("--rooms", type=int, default=8)
+    parser.add_argument("--room-9-relay", action="store_true")
+    parser.add_argument("--no-groups", action="store_true")
+    parser.add_argument("--max-power-usage", type=float, help="kW")
+    parser.add_argument(
+        "--show",
+        choices=["changes", "all", "none"],
+        default="changes",
+        help="which values to print for every cycle",
+    )
+
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""Simulate the Modbus TCP interface of an IDM Navigator controller.
+
+Run from the repository root:
+
+    PYTHONPATH=custom_components python -m tools.simulator --port 5020
+
+and point one of the benchmarks at that port. The simulator serves every register of the selected heating circuits and zones
+with generated values, accepts writes and can inject latency, jitter, dropped
+responses and illegal address errors.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import math
+import random
+import struct
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import SensorStateClass
+from idm_heatpump.const import MAX_ROOM_COUNT, MAX_ZONE_COUNT, MODBUS_MAX_READ_COUNT
+from idm_heatpump.pymodbus_compat import convert_to_registers
+from idm_heatpump.sensor_addresses import (
+    BINARY_SENSOR_ADDRESSES,
+    SENSOR_ADDRESSES,
+    BaseSensorAddress,
+    HeatingCircuit,
+    IdmBinarySensorAddress,
+    ZoneModule,
+    heating_circuit_sensors,
+)
+from pymodbus.client.mixin import ModbusClientMixin
+
+LOGGER = logging.getLogger(__name__)
+
+_READ_HOLDING_REGISTERS = 0x03
+_READ_INPUT_REGISTERS = 0x04
+_WRITE_SINGLE_REGISTER = 0x06
+_WRITE_MULTIPLE_REGISTERS = 0x10
+
+_ILLEGAL_FUNCTION = 0x01
+_ILLEGAL_DATA_ADDRESS = 0x02
+_ILLEGAL_DATA_VALUE = 0x03
+
+_MBAP_HEADER = struct.Struct(">HHHB")
+
+
+class _ModbusError(Exception):
+    def __init__(self, code: int):
+        super().__init__(code)
+        self.code = code
+
+
+def register_map(
+    circuits: list[HeatingCircuit], zones: list[ZoneModule]
+) -> list[BaseSensorAddress]:
+    """Get all sensors served for the given circuits and zones."""
+    return sorted(
+        [
+            *SENSOR_ADDRESSES.values(),
+            *BINARY_SENSOR_ADDRESSES.values(),
+            *[s for c in circuits for s in heating_circuit_sensors(c)],
+            *[s for zone in zones for s in zone.sensors()],
+            *[s for zone in zones for s in zone.binary_sensors()],
+        ],
+        key=lambda s: s.address,
+    )
+
+
+def _value_generator(
+    sensor: BaseSensorAddress, rng: random.Random
+) -> Callable[[float], int | float]:
+    """Get a function returning the raw value of `sensor` at time `t`."""
+    if isinstance(sensor, IdmBinarySensorAddress):
+        period = rng.uniform(60, 600)
+        return lambda t: int(t // period) % 2
+
+    enum = getattr(sensor, "enum", None)
+    if enum is not None:
+        value = rng.choice([m.value for m in enum if m.value != 0xFFFF])
+        return lambda t: value
+
+    if getattr(sensor, "flag", None) is not None:
+        return lambda t: 0
+
+    low = sensor.min_value if sensor.min_value is not None else 0
+    if sensor.datatype == ModbusClientMixin.DATATYPE.UINT16:
+        low = max(low, 0)
+    high = sensor.max_value if sensor.max_value not in (None, 0xFFFE) else low + 50
+
+    if sensor.datatype == ModbusClientMixin.DATATYPE.FLOAT32:
+        scale = sensor.scale
+        if sensor.state_class == SensorStateClass.TOTAL_INCREASING:
+            start = rng.uniform(0, 10000)
+            rate = rng.uniform(0.0001, 0.01)
+            return lambda t: (start + rate * t) / scale
+
+        period = rng.uniform(300, 3600)
+        phase = rng.uniform(0, 2 * math.pi)
+        noise = (high - low) / 200
+
+        def generate_float(t: float) -> float:
+            value = low + (high - low) * (
+                0.5 + 0.4 * math.sin(2 * math.pi * t / period + phase)
+            )
+            value = min(max(value + rng.uniform(-noise, noise), low), high)
+            return round(value, sensor.decimal_digits) / scale
+
+        return generate_float
+
+    value = rng.randint(low, high)
+    return lambda t: value
+
+
+@dataclass
+class SimulatorStats:
+    """Counters of a running simulator."""
+
+    requests: int = 0
+    dropped: int = 0
+    faults: int = 0
+    bytes_received: int = 0
+    bytes_sent: int = 0
+
+
+class SimulatedController:
+    """Register map of a simulated controller and its Modbus TCP server."""
+
+    def __init__(
+        self,
+        sensors: list[BaseSensorAddress],
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        fault_rate: float = 0.0,
+        max_read_count: int = MODBUS_MAX_READ_COUNT,
+        unmapped_illegal: bool = False,
+        unmapped_value: int = 0,
+        capacity: int = 1,
+        refresh_interval: float | None = 1.0,
+        seed: int | None = None,
+    ) -> None:
+        """Create simulator serving `sensors`.
+
+        `latency` and `jitter` are in seconds, `drop_rate` and `fault_rate`
+        are the probabilities of not answering a request and of answering it
+        with an illegal data address error. Registers without a sensor read as
+        `unmapped_value`, or fail with an illegal data address error if
+        `unmapped_illegal` is set. `capacity` limits the number of
+        requests that are processed at the same time. Values are generated
+        again every `refresh_interval` seconds, if it is None only when
+        `refresh` is called.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.fault_rate = fault_rate
+        self.max_read_count = max_read_count
+        self.unmapped_illegal = unmapped_illegal
+        self.unmapped_value = unmapped_value
+        self.refresh_interval = refresh_interval
+        self.stats = SimulatorStats()
+
+        self._rng = random.Random(seed)
+        self._busy = asyncio.Semaphore(capacity)
+        self._start = time.monotonic()
+        self._registers: dict[int, int] = {}
+        self._generators: dict[int, tuple[BaseSensorAddress, Callable]] = {}
+        self._written: set[int] = set()
+        self._refreshed_at: float | None = None
+
+        for sensor in sensors:
+            self._generators[sensor.address] = (
+                sensor,
+                _value_generator(sensor, self._rng),
+            )
+            for address in range(sensor.address, sensor.address + sensor.size):
+                self._registers[address] = 0
+
+    def refresh(self):
+        """Generate new values for all registers that weren't written."""
+        now = time.monotonic() - self._start
+        self._refreshed_at = now
+
+        for address, (sensor, generate) in self._generators.items():
+            if address in self._written:
+                continue
+            for i, register in enumerate(
+                convert_to_registers(generate(now), sensor.datatype)
+            ):
+                self._registers[address + i] = register
+
+    def read(self, address: int, count: int) -> list[int]:
+        """Read registers like the controller would."""
+        if count < 1 or count > self.max_read_count:
+            raise _ModbusError(_ILLEGAL_DATA_VALUE)
+
+        if self._refreshed_at is None or (
+            self.refresh_interval is not None
+            and time.monotonic() - self._start - self._refreshed_at
+            >= self.refresh_interval
+        ):
+            self.refresh()
+
+        registers = []
+        for register in range(address, address + count):
+            value = self._registers.get(register)
+            if value is None:
+                if self.unmapped_illegal:
+                    raise _ModbusError(_ILLEGAL_DATA_ADDRESS)
+                value = self.unmapped_value
+            registers.append(value)
+        return registers
+
+    def write(self, address: int, values: list[int]):
+        """Write registers like the controller would."""
+        if self.unmapped_illegal and any(
+            register not in self._registers
+            for register in range(address, address + len(values))
+        ):
+            raise _ModbusError(_ILLEGAL_DATA_ADDRESS)
+
+        for i, value in enumerate(values):
+            self._registers[address + i] = value
+            # written values are kept until the simulator restarts
+            self._written.add(address + i)
+
+    def _handle_pdu(self, pdu: bytes) -> bytes:
+        function = pdu[0]
+        if function in (_READ_HOLDING_REGISTERS, _READ_INPUT_REGISTERS):
+            address, count = struct.unpack_from(">HH", pdu, 1)
+            registers = self.read(address, count)
+            return struct.pack(
+                f">BB{len(registers)}H", function, 2 * len(registers), *registers
+            )
+
+        if function == _WRITE_SINGLE_REGISTER:
+            address, value = struct.unpack_from(">HH", pdu, 1)
+            self.write(address, [value])
+            return pdu[:5]
+
+        if function == _WRITE_MULTIPLE_REGISTERS:
+            address, count, _ = struct.unpack_from(">HHB", pdu, 1)
+            self.write(address, list(struct.unpack_from(f">{count}H", pdu, 6)))
+            return pdu[:5]
+
+        raise _ModbusError(_ILLEGAL_FUNCTION)
+
+    async def _handle_request(
+        self,
+        header: tuple[int, int, int, int],
+        pdu: bytes,
+        writer: asyncio.StreamWriter,
+    ):
+        transaction_id, protocol_id, _, unit_id = header
+        self.stats.requests += 1
+
+        async with self._busy:
+            await asyncio.sleep(
+                max(self.latency + self._rng.uniform(-self.jitter, self.jitter), 0)
+            )
+
+            if self._rng.random() < self.drop_rate:
+                self.stats.dropped += 1
+                LOGGER.debug("dropping transaction %d", transaction_id)
+                return
+
+            try:
+                if self._rng.random() < self.fault_rate:
+                    raise _ModbusError(_ILLEGAL_DATA_ADDRESS)
+                response = self._handle_pdu(pdu)
+            except _ModbusError as error:
+                self.stats.faults += 1
+                response = bytes([pdu[0] | 0x80, error.code])
+            except struct.error:
+                self.stats.faults += 1
+                response = bytes([pdu[0] | 0x80, _ILLEGAL_DATA_VALUE])
+
+        frame = (
+            _MBAP_HEADER.pack(transaction_id, protocol_id, len(response) + 1, unit_id)
+            + response
+        )
+        self.stats.bytes_sent += len(frame)
+        writer.write(frame)
+        await writer.drain()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        LOGGER.debug("client connected: %s", writer.get_extra_info("peername"))
+        tasks: set[asyncio.Task] = set()
+        try:
+            while True:
+                header = _MBAP_HEADER.unpack(await reader.readexactly(7))
+                pdu = await reader.readexactly(header[2] - 1)
+                self.stats.bytes_received += 7 + len(pdu)
+
+                task = asyncio.create_task(self._handle_request(header, pdu, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            LOGGER.debug("client disconnected")
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> asyncio.Server:
+        """Start serving Modbus TCP requests."""
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+
+async def _main(args: argparse.Namespace):
+    sensors = register_map(
+        [HeatingCircuit[c] for c in args.circuits],
+        [ZoneModule(i, args.rooms, True) for i in range(args.zones)],
+    )
+    controller = SimulatedController(
+        sensors,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        drop_rate=args.drop_rate,
+        fault_rate=args.fault_rate,
+        max_read_count=args.max_read_count,
+        unmapped_illegal=args.unmapped == "illegal",
+        unmapped_value=0xFFFF if args.unmapped == "ffff" else 0,
+        capacity=args.capacity,
+        seed=args.seed,
+    )
+    server = await controller.serve(args.bind, args.port)
+    print(f"serving {len(sensors)} sensors on {args.bind}:{args.port}")
+
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument(
+        "--circuits", nargs="*", default=[c.name for c in HeatingCircuit]
+    )
+    parser.add_argument("--zones", type=int, default=MAX_ZONE_COUNT)
+    parser.add_argument("--rooms", type=int, default=MAX_ROOM_COUNT)
+    parser.add_argument("--latency", type=float, default=50, help="ms per request")
+    parser.add_argument("--jitter", type=float, default=10, help="ms")
+    parser.add_argument(
+        "--drop-rate", type=float, default=0, help="probability of no response"
+    )
+    parser.add_argument(
+        "--fault-rate",
+        type=float,
+        default=0,
+        help="probability of an illegal data address error",
+    )
+    parser.add_argument("--max-read-count", type=int, default=MODBUS_MAX_READ_COUNT)
+    parser.add_argument(
+        "--unmapped",
+        choices=["zero", "ffff", "illegal"],
+        default="zero",
+        help="how reads of registers without a sensor are answered",
+    )
+    parser.add_argument("--capacity", type=int, default=1)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""Stand-in for the responses of pymodbus clients used by the tools."""
+
+
+class RegistersResponse:
+    """Successful response to a register read."""
+
+    def __init__(self, registers: list[int]):
+        """Wrap the registers that were read."""
+        self.registers = registers
+
+    def isError(self) -> bool:
+        """Check whether the response is an error, which it never is."""
+        return False